@@ -1,23 +1,119 @@
 import numpy as np
+from algorithms.tsp_local_search import LocalSearch
+from core.distance_matrix import DistanceMatrix
 
 
 def calculate_tour_distance(route, dist_matrix):
-    """Pomocná funkce pro výpočet celkové délky cesty."""
-    distance = 0.0
-    for i in range(len(route)):
-        city_a = route[i]
-        city_b = route[(i + 1) % len(route)]  # % pro uzavření cesty
-        distance += dist_matrix[city_a, city_b]
-    return distance
+    """Pomocná funkce pro výpočet celkové délky cesty (dist_matrix: np.ndarray nebo DistanceMatrix)."""
+    route = np.asarray(route)
+    # np.roll pro uzavření cesty (poslední město -> první)
+    return dist_matrix[route, np.roll(route, -1)].sum()
+
+
+def _construct_tours(weights, n_ants):
+    """
+    Všichni mravenci staví cestu současně.
+    weights: předpočítaná matice τ^α * η^β, navštívená města se maskují bitmapou.
+    Vrací matici cest tvaru (n_ants, n_cities).
+    """
+    n_cities = len(weights)
+    ants = np.arange(n_ants)
+
+    # Každý mravenec začíná v jiném městě.
+    current = ants % n_cities
+    routes = np.empty((n_ants, n_cities), dtype=np.intp)
+    routes[:, 0] = current
+    visited = np.zeros((n_ants, n_cities), dtype=bool)
+    visited[ants, current] = True
+
+    for step in range(1, n_cities):
+        # τ(r,s)^α * η(r,s)^β pro všechny mravence, nenavštívená města
+        w = weights[current] * ~visited
+        cumulative = np.cumsum(w, axis=1)
+
+        # Σ [τ(r,u)^α * η(r,u)^β] == 0 => rovnoměrně mezi nenavštívenými
+        stuck = cumulative[:, -1] <= 0
+        if np.any(stuck):
+            cumulative[stuck] = np.cumsum(~visited[stuck], axis=1)
+
+        # --- Výběr dalšího města (ruleta pro všechny mravence najednou) ---
+        r = np.random.rand(n_ants) * cumulative[:, -1]
+        next_city = np.argmax(cumulative > r[:, None], axis=1)
+
+        routes[:, step] = next_city
+        visited[ants, next_city] = True
+        current = next_city
+
+    return routes
+
+
+def _construct_tours_candidates(weights, neighbors, dist, n_ants):
+    """
+    Konstrukce cest s kandidátními seznamy.
+    weights: τ^α * η^β jen na hranách ke k nejbližším sousedům, tvar (n, k).
+    Pokud mravenec už navštívil všechny své kandidáty, vybere nejbližší
+    nenavštívené město z celé množiny (feromon mimo kandidátní hrany je τ0).
+    """
+    n_cities = len(dist)
+    ants = np.arange(n_ants)
+
+    current = ants % n_cities
+    routes = np.empty((n_ants, n_cities), dtype=np.intp)
+    routes[:, 0] = current
+    visited = np.zeros((n_ants, n_cities), dtype=bool)
+    visited[ants, current] = True
+
+    for step in range(1, n_cities):
+        candidates = neighbors[current]
+        w = weights[current] * ~visited[ants[:, np.newaxis], candidates]
+        cumulative = np.cumsum(w, axis=1)
+
+        # Ruleta mezi nenavštívenými kandidáty
+        r = np.random.rand(n_ants) * cumulative[:, -1]
+        column = np.argmax(cumulative > r[:, None], axis=1)
+        next_city = candidates[ants, column]
+
+        # Kandidátní seznam vyčerpán => nejbližší nenavštívené město z celé množiny
+        exhausted = np.flatnonzero(cumulative[:, -1] <= 0)
+        if len(exhausted) > 0:
+            d = dist.pair(current[exhausted, np.newaxis], np.arange(n_cities)[np.newaxis, :]).astype(float)
+            d[visited[exhausted]] = np.inf
+            next_city[exhausted] = np.argmin(d, axis=1)
+
+        routes[:, step] = next_city
+        visited[ants, next_city] = True
+        current = next_city
+
+    return routes
+
+
+def _improve_routes(routes, distances, improver):
+    """Memetická fáze: lokálně zlepší cestu každého mravence (in place, včetně délek)."""
+    for ant in range(len(routes)):
+        routes[ant], gain = improver.improve(routes[ant])
+        distances[ant] -= gain
+
+
+def _deposit_candidates(tau, neighbors, from_cities, to_cities, amounts):
+    """Přičte feromon na hrany (a, b), které leží v kandidátním seznamu města a."""
+    match = neighbors[from_cities] == to_cities[:, np.newaxis]
+    on_list = np.any(match, axis=1)
+    column = np.argmax(match, axis=1)
+    k = neighbors.shape[1]
+    slots = from_cities[on_list] * k + column[on_list]
+    tau += np.bincount(slots, weights=amounts[on_list], minlength=tau.size).reshape(tau.shape)
 
 
 def ant_colony_optimization(cities, n_ants=20, n_iterations=200,
-                            alpha=1.0, beta=2.0, rho=0.5, Q=1.0):
+                            alpha=1.0, beta=2.0, rho=0.5, Q=1.0, candidate_k=None,
+                            local_search=None, ls_max_moves=None, ls_time_limit=None):
     """
     Implementace Ant Colony Optimization (ACO) pro problém TSP.
+    Všichni mravenci krokují současně a feromon se pokládá najednou pro všechny cesty.
 
     Args:
-        cities (np.ndarray): Matice (n_cities, 2) se souřadnicemi měst.
+        cities (np.ndarray): Matice (n_cities, 2) se souřadnicemi měst
+                             (nebo sdílená DistanceMatrix).
         n_ants (int): Počet mravenců v kolonii. Dle zadání by měl být
                       založen na počtu měst (např. n_ants = n_cities).
         n_iterations (int): Počet generací/iterací algoritmu.
@@ -25,6 +121,14 @@ def ant_colony_optimization(cities, n_ants=20, n_iterations=200,
         beta (float): Váha viditelnosti (η). V příkladu = 2.0.
         rho (float): Míra vypařování feromonu (ρ). V příkladu = 0.5.
         Q (float): Konstanta pro pokládání feromonu. V příkladu = 1.0.
+        candidate_k (int): Pokud je zadáno, mravenec vybírá jen z k nejbližších
+                           sousedů aktuálního města (po jejich vyčerpání nejbližší
+                           nenavštívené město) a feromon se ukládá jen na tyto hrany.
+                           Paměť O(n·k) místo O(n²) – pro instance s tisíci měst.
+        local_search (str): Volitelné lokální zlepšení cesty každého mravence před
+                            pokládáním feromonu: "2opt", "oropt" nebo "2opt+oropt".
+        ls_max_moves (int): Limit počtu tahů lokálního hledání na jednu cestu.
+        ls_time_limit (float): Časový limit lokálního hledání na jednu cestu [s].
 
     Returns:
         tuple: (best_route, best_distance, history)
@@ -32,26 +136,36 @@ def ant_colony_optimization(cities, n_ants=20, n_iterations=200,
                best_distance: Délka nejlepší nalezené trasy.
                history: Seznam (best_route, best_distance) pro každou generaci.
     """
-    n_cities = len(cities)
+    if candidate_k is not None:
+        # Kandidátní varianta nepotřebuje plnou matici – vzdálenosti se počítají
+        # jen pro kandidátní hrany a cesty, paměť zůstává O(n·k)
+        dist = DistanceMatrix.for_cities(cities, lazy=True)
+        n_cities = len(dist)
+        return _aco_candidates(dist, n_ants, n_iterations, alpha, beta, rho, Q,
+                               min(candidate_k, n_cities - 1),
+                               local_search, ls_max_moves, ls_time_limit)
 
     # --- 1. Inicializace ---
 
-    # Výpočet matice vzdáleností (d)
-    dist_matrix = np.zeros((n_cities, n_cities))
-    for i in range(n_cities):
-        for j in range(i + 1, n_cities):
-            dist = np.linalg.norm(cities[i] - cities[j])
-            dist_matrix[i, j] = dist
-            dist_matrix[j, i] = dist
+    # Matice vzdáleností (d) – sdílená, postavená broadcastingem
+    dist = DistanceMatrix.for_cities(cities, lazy=False)
+    n_cities = len(dist)
+    dist_matrix = dist.matrix
 
     # Výpočet matice viditelnosti (η = 1/d)
     # Přidáme malou epsilon, abychom se vyhnuli dělení nulou (pro i == j)
     eta = 1.0 / (dist_matrix + 1e-10)
     np.fill_diagonal(eta, 0)  # Mravenec nemůže přejít do stejného města
+    eta_beta = eta ** beta
 
     # Inicializace matice feromonů (τ)
     tau = np.ones((n_cities, n_cities))
 
+    # Lokální hledání se seznamy nejbližších sousedů – připraví se jednou pro celý běh
+    if local_search is not None:
+        ls_neighbors, _ = dist.nearest_neighbors(8)
+        improver = LocalSearch(dist, ls_neighbors, local_search, ls_max_moves, ls_time_limit)
+
     # Proměnné pro sledování nejlepší cesty
     best_global_route = None
     best_global_distance = float('inf')
@@ -60,71 +174,75 @@ def ant_colony_optimization(cities, n_ants=20, n_iterations=200,
     # --- 2. Hlavní cyklus algoritmu ---
     for iteration in range(n_iterations):
 
-        all_ant_routes = []
-        all_ant_distances = []
+        # Konstrukce cest všech mravenců najednou
+        routes = _construct_tours((tau ** alpha) * eta_beta, n_ants)
+        distances = dist.tour_lengths(routes)
+        if local_search is not None:
+            _improve_routes(routes, distances, improver)
+        next_cities = np.roll(routes, -1, axis=1)
 
-        # Pro každého mravence...
-        for ant in range(n_ants):
+        # Aktualizace globálního optima
+        best_ant = np.argmin(distances)
+        if distances[best_ant] < best_global_distance:
+            best_global_distance = distances[best_ant]
+            best_global_route = routes[best_ant].tolist()
 
-            # Každý mravenec začíná v jiném městě.
-            current_city = ant % n_cities
-            route = [current_city]
-            visited = {current_city}
-
-            # Konstrukce cesty (navštívení n_cities měst)
-            while len(route) < n_cities:
-                unvisited_cities = [city for city in range(n_cities) if city not in visited]
+        # Uložení nejlepšího výsledku této iterace pro vizualizaci
+        history.append((best_global_route.copy(), best_global_distance))
 
-                # --- Výpočet pravděpodobností přechodu (podle PDF) ---
+        # --- 3. Aktualizace feromonů (na konci "migration loop") ---
 
-                # τ(r,s)^α * η(r,s)^β
-                numerators = np.zeros(len(unvisited_cities))
-                for i, next_city in enumerate(unvisited_cities):
-                    tau_rs = tau[current_city, next_city]
-                    eta_rs = eta[current_city, next_city]
-                    numerators[i] = (tau_rs ** alpha) * (eta_rs ** beta)
+        # 3.1 Vypařování (Evaporation)
+        tau = (1.0 - rho) * tau
 
-                # Σ [τ(r,u)^α * η(r,u)^β]
-                denominator = np.sum(numerators)
+        # 3.2 Pokládání (Deposition) – scatter-add přes všechny hrany všech cest
+        delta_tau = np.repeat(Q / distances, n_cities)
+        edges = routes.ravel() * n_cities + next_cities.ravel()
+        deposit = np.bincount(edges, weights=delta_tau, minlength=n_cities * n_cities)
+        deposit = deposit.reshape(n_cities, n_cities)
+        tau += deposit + deposit.T
 
-                if denominator == 0:
-                    probs = np.ones(len(unvisited_cities)) / len(unvisited_cities)
-                else:
-                    probs = numerators / denominator
+    return best_global_route, best_global_distance, history
 
-                # --- Výběr dalšího města ---
-                next_city = np.random.choice(unvisited_cities, p=probs)
 
-                route.append(next_city)
-                visited.add(next_city)
-                current_city = next_city
+def _aco_candidates(dist, n_ants, n_iterations, alpha, beta, rho, Q, k,
+                    local_search, ls_max_moves, ls_time_limit):
+    """ACO s kandidátními seznamy a řídkým feromonem (n, k) – viz ant_colony_optimization."""
+    n_cities = len(dist)
 
-            # Cesta je hotová, uložíme ji
-            all_ant_routes.append(route)
-            distance = calculate_tour_distance(route, dist_matrix)
-            all_ant_distances.append(distance)
+    # --- 1. Inicializace ---
+    neighbors, neighbor_dist = dist.nearest_neighbors(k)
+    eta_beta = (1.0 / (neighbor_dist + 1e-10)) ** beta
+    tau = np.ones((n_cities, k))
+    if local_search is not None:
+        improver = LocalSearch(dist, neighbors, local_search, ls_max_moves, ls_time_limit)
 
-            # Aktualizace globálního optima
-            if distance < best_global_distance:
-                best_global_distance = distance
-                best_global_route = route
+    best_global_route = None
+    best_global_distance = float('inf')
+    history = []
 
-        # Uložení nejlepšího výsledku této iterace pro vizualizaci
-        history.append((best_global_route.copy(), best_global_distance))
+    # --- 2. Hlavní cyklus algoritmu ---
+    for iteration in range(n_iterations):
 
-        # --- 3. Aktualizace feromonů (na konci "migration loop") ---
+        routes = _construct_tours_candidates((tau ** alpha) * eta_beta, neighbors, dist, n_ants)
+        distances = dist.tour_lengths(routes)
+        next_cities = np.roll(routes, -1, axis=1)
+        if local_search is not None:
+            _improve_routes(routes, distances, improver)
+            next_cities = np.roll(routes, -1, axis=1)
 
-        # 3.1 Vypařování (Evaporation)
-        tau = (1.0 - rho) * tau
+        best_ant = np.argmin(distances)
+        if distances[best_ant] < best_global_distance:
+            best_global_distance = distances[best_ant]
+            best_global_route = routes[best_ant].tolist()
 
-        # 3.2 Pokládání (Deposition)
-        for route, distance in zip(all_ant_routes, all_ant_distances):
-            delta_tau = Q / distance
-            for i in range(n_cities):
-                city_a = route[i]
-                city_b = route[(i + 1) % n_cities]
+        history.append((best_global_route.copy(), best_global_distance))
 
-                tau[city_a, city_b] += delta_tau
-                tau[city_b, city_a] += delta_tau
+        # --- 3. Aktualizace feromonů (jen kandidátní hrany, v obou směrech) ---
+        tau *= (1.0 - rho)
+        delta_tau = np.repeat(Q / distances, n_cities)
+        a, b = routes.ravel(), next_cities.ravel()
+        _deposit_candidates(tau, neighbors, a, b, delta_tau)
+        _deposit_candidates(tau, neighbors, b, a, delta_tau)
 
-    return best_global_route, best_global_distance, history
\ No newline at end of file
+    return best_global_route, best_global_distance, history
@@ -1,29 +1,118 @@
 import numpy as np
+from core.precision import resolve_dtype, random_uniform
+from core.registry import register
+from core.history import HistoryRecorder
 
 
-def blind_search(func, iterations=500):
+def _first_primes(n):
+    """Prvních n prvočísel (báze Haltonovy posloupnosti)."""
+    primes = []
+    candidate = 2
+    while len(primes) < n:
+        if all(candidate % p for p in primes if p * p <= candidate):
+            primes.append(candidate)
+        candidate += 1
+    return primes
+
+
+def _halton(start, n, bases):
+    """Body start..start+n-1 Haltonovy posloupnosti v [0, 1)^D (radikální inverze po dimenzích)."""
+    indices = np.arange(start, start + n)
+    points = np.empty((n, len(bases)))
+    for d, base in enumerate(bases):
+        i = indices.copy()
+        value = np.zeros(n)
+        factor = 1.0 / base
+        while np.any(i > 0):
+            value += factor * (i % base)
+            i //= base
+            factor /= base
+        points[:, d] = value
+    return points
+
+
+@register("Blind", iterations_param="iterations", record_history=False)
+def blind_search(func, iterations=500, chunk_size=100_000, top_k=None, sampler="uniform", record_history=True,
+                 history_every=1, dtype=None):
     """
     Blind Search (náhodné hledání) pro libovolnou funkci.
 
+    Vzorky se generují a vyhodnocují po blocích velikosti chunk_size, nejlepší
+    bod se průběžně hledá redukcí nad polem.
+
+    Paměť: ve výchozím nastavení (top_k=None, record_history=True) se ukládá
+    celá historie pro vizualizaci, paměť tedy roste s počtem uložených vzorků
+    O(iterations / history_every × D) – nealokuje se dopředu, viz HistoryRecorder.
+    Konstantní paměť O(chunk_size × D) vyžaduje zadat top_k, nebo vypnout
+    record_history (výchozí při běhu přes registr, viz core.registry).
+
     Args:
         func: instance testovací funkce (musí mít .evaluate(), .lower_bound, .upper_bound, .dimension)
         iterations: počet náhodných vzorků
+        chunk_size: počet vzorků generovaných a vyhodnocených najednou
+        top_k: počet nejlepších bodů, které se uchovají místo celé historie
+               (None = ukládá se celá historie – paměť O(iterations), 0 = nic)
+        sampler: "uniform" (pseudonáhodně) nebo "halton" (kvazináhodná Haltonova
+                 posloupnost s náhodným posunem)
+        record_history: ukládat navštívené body (viz core.history.HistoryRecorder)
+        history_every: ukládat jen každý history_every-tý vzorek (jen bez top_k)
+        dtype: datový typ vzorků (None = globální výchozí, viz core.precision)
 
     Returns:
         best_x: nejlepší nalezený vektor parametrů
         best_f: hodnota funkce v best_x
-        history: seznam všech navštívených bodů [(x, f), ...]
+        history: HistoryRecorder navštívených bodů (chová se jako seznam [(x, f), ...]),
+                 při zadaném top_k jen top_k nejlepších bodů (seřazeno od nejlepšího)
     """
+    if sampler not in ("uniform", "halton"):
+        raise ValueError(f"Neznámý sampler: {sampler!r} (povoleno 'uniform' nebo 'halton')")
+
+    dtype = resolve_dtype(dtype)
+    dim = func.dimension
+    lower, upper = func.lower_bound, func.upper_bound
+
+    if sampler == "halton":
+        bases = _first_primes(dim)
+        shift = np.random.rand(dim)  # Cranley-Pattersonova rotace
+
     best_x = None
     best_f = float("inf")
-    history = []
+    record_all = record_history and top_k is None
+    history = HistoryRecorder(iterations if record_all else (top_k or 0), None, dim,
+                              every=history_every if record_all else 1, dtype=dtype, enabled=record_history)
+    top_x = np.empty((0, dim), dtype=dtype)
+    top_f = np.empty(0)
+
+    for start in range(0, iterations, chunk_size):
+        n = min(chunk_size, iterations - start)
+        if sampler == "uniform":
+            X = random_uniform(lower, upper, (n, dim), dtype)
+        else:
+            unit = (_halton(start + 1, n, bases) + shift) % 1.0
+            X = (lower + unit * (upper - lower)).astype(dtype)
+        values = func.evaluate_batch(X)
+
+        idx = np.argmin(values)
+        if values[idx] < best_f:
+            best_x, best_f = X[idx].copy(), values[idx]
 
-    for _ in range(iterations):
-        x = np.random.uniform(func.lower_bound, func.upper_bound, func.dimension)
-        f = func.evaluate(x)
-        history.append((x, f))
+        if not record_history:
+            continue
+        if top_k is None:
+            history.record_many(X, values)
+        elif top_k > 0:
+            # top_k z bloku, pak sloučit s dosavadními top_k
+            if n > top_k:
+                part = np.argpartition(values, top_k - 1)[:top_k]
+                X, values = X[part], values[part]
+            top_x = np.concatenate([top_x, X])
+            top_f = np.concatenate([top_f, values])
+            if len(top_f) > top_k:
+                part = np.argpartition(top_f, top_k - 1)[:top_k]
+                top_x, top_f = top_x[part], top_f[part]
 
-        if f < best_f:
-            best_x, best_f = x, f
+    if record_history and top_k is not None:
+        order = np.argsort(top_f)
+        history.record_many(top_x[order], top_f[order])
 
     return best_x, best_f, history
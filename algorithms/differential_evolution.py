@@ -1,77 +1,80 @@
 import numpy as np
-from copy import deepcopy
+from core.precision import resolve_dtype, random_uniform
+from core.registry import register
+from core.history import HistoryRecorder
 
 
-class Solution:
-    """Reprezentace jednoho řešení pro Differential Evolution."""
-    def __init__(self, dimension, lower_bound, upper_bound):
-        self.dimension = dimension
-        self.lower_bound = lower_bound
-        self.upper_bound = upper_bound
-        self.params = np.random.uniform(lower_bound, upper_bound, dimension)
-        self.f = None  # fitness hodnota
+def _mutation_indices(NP):
+    """
+    Pro každého jedince i vybere najednou tři různé indexy r1, r2, r3 (všechny != i).
+    Náhodné klíče s nekonečnem na diagonále => argsort dá náhodnou permutaci bez i.
+    """
+    keys = np.random.rand(NP, NP)
+    np.fill_diagonal(keys, np.inf)
+    idx = np.argsort(keys, axis=1)[:, :3]
+    return idx[:, 0], idx[:, 1], idx[:, 2]
 
 
-def differential_evolution(function, NP=30, F=0.8, CR=0.9, G=200):
+@register("DE", iterations_param="G", evaluations_per_iteration=lambda p: p["NP"], record_history=False)
+def differential_evolution(function, NP=30, F=0.8, CR=0.9, G=200, record_history=True, history_every=1,
+                           dtype=None):
     """
-    Differential Evolution (DE) algoritmus.
+    Differential Evolution (DE/rand/1/bin) algoritmus.
+    Populace je držena jako matice (NP, D) a celá generace (mutace, křížení,
+    selekce) se počítá najednou, evaluace jedním dávkovým voláním.
     :param function: instance třídy Function (např. Griewank)
     :param NP: velikost populace
     :param F: faktor mutace
     :param CR: crossover rate
     :param G: počet generací
-    :return: nejlepší nalezené řešení, jeho fitness a historie populací
+    :param record_history: ukládat populace pro vizualizaci (viz core.history.HistoryRecorder)
+    :param history_every: ukládat jen každou history_every-tou generaci
+    :param dtype: datový typ populace (None = globální výchozí, viz core.precision)
+    :return: nejlepší nalezené řešení, jeho fitness a historie populací (HistoryRecorder:
+             pole positions (G, NP, D) a fitness (G, NP), history[g] = [(x, f), ...] generace g)
     """
+    if NP < 4:
+        raise ValueError("DE/rand/1 potřebuje alespoň 4 jedince (NP >= 4)")
+
     dimension = function.dimension
     lower = function.lower_bound
     upper = function.upper_bound
+    dtype = resolve_dtype(dtype)
 
     # inicializace populace
-    pop = [Solution(dimension, lower, upper) for _ in range(NP)]
-    for ind in pop:
-        ind.f = function.evaluate(ind.params)
+    pop = random_uniform(lower, upper, (NP, dimension), dtype)
+    fitness = function.evaluate_batch(pop)
 
     # uložíme počáteční populaci
-    history = [[(ind.params.copy(), ind.f) for ind in pop]]
+    history = HistoryRecorder(G, NP, dimension, every=history_every, dtype=dtype, enabled=record_history)
+    history.record(pop, fitness)
+
+    rows = np.arange(NP)
 
     # hlavní evoluční smyčka
     for g in range(G - 1):
-        new_pop = deepcopy(pop)
-
-        for i, x_i in enumerate(pop):
-            # výběr tří různých jedinců
-            indices = list(range(NP))
-            indices.remove(i)
-            r1, r2, r3 = np.random.choice(indices, 3, replace=False)
-            x_r1, x_r2, x_r3 = pop[r1], pop[r2], pop[r3]
-
-            # mutace
-            v = x_r3.params + F * (x_r1.params - x_r2.params)
-            v = np.clip(v, lower, upper)
+        # výběr tří různých jedinců pro každého i
+        r1, r2, r3 = _mutation_indices(NP)
 
-            # křížení
-            u = np.zeros(dimension)
-            j_rand = np.random.randint(0, dimension)
-            for j in range(dimension):
-                if np.random.uniform() < CR or j == j_rand:
-                    u[j] = v[j]
-                else:
-                    u[j] = x_i.params[j]
+        # mutace
+        V = pop[r3] + F * (pop[r1] - pop[r2])
+        V = np.clip(V, lower, upper)
 
-            # selekce
-            f_u = function.evaluate(u)
-            if f_u <= x_i.f:  # minimalizace
-                new_pop[i].params = u
-                new_pop[i].f = f_u
+        # binomické křížení (j_rand zaručí aspoň jeden gen z mutantu)
+        cross = np.random.rand(NP, dimension) < CR
+        cross[rows, np.random.randint(0, dimension, NP)] = True
+        U = np.where(cross, V, pop)
 
-        # aktualizace populace
-        pop = new_pop
+        # selekce (minimalizace)
+        f_U = function.evaluate_batch(U)
+        improved = f_U <= fitness
+        pop[improved] = U[improved]
+        fitness[improved] = f_U[improved]
 
         # uložení celé populace do historie
-        generation_data = [(ind.params.copy(), ind.f) for ind in pop]
-        history.append(generation_data)
+        history.record(pop, fitness)
 
     # najdi nejlepší řešení
-    best = min(pop, key=lambda s: s.f)
+    best = np.argmin(fitness)
 
-    return best.params, best.f, history
+    return pop[best].copy(), fitness[best], history
@@ -1,19 +1,27 @@
 import numpy as np
-from copy import deepcopy
+from core.precision import resolve_dtype, random_uniform, random_normal
+from core.registry import register
+from core.history import HistoryRecorder
 
 
-class Firefly:
-    """Reprezentace jedné světlušky."""
-
-    def __init__(self, dimension, lower_bound, upper_bound):
-        self.dimension = dimension
-        self.position = np.random.uniform(lower_bound, upper_bound, dimension)
-        self.fitness = np.inf  # Fitness = Intenzita světla (nižší je lepší)
+def _pairwise_differences(positions):
+    """
+    Rozdíly diff[i, j] = x_j - x_i a vzdálenosti r[i, j] = ||x_j - x_i||.
+    Počítá se z přímých rozdílů, ne přes Gramovu matici (|a|² + |b|² - 2a·b),
+    která ve float32 na škále Schwefelu ztrácí přesnost blízkých světlušek.
+    """
+    diff = positions[None, :, :] - positions[:, None, :]
+    return diff, np.linalg.norm(diff, axis=-1)
 
 
-def firefly_algorithm(function, pop_size=20, alpha=0.3, beta_0=1.0, max_gen=50):
+@register("FA", iterations_param="max_gen", evaluations_per_iteration=lambda p: p["pop_size"],
+          record_history=False)
+def firefly_algorithm(function, pop_size=20, alpha=0.3, beta_0=1.0, max_gen=50, rule="first",
+                      record_history=True, history_every=1, dtype=None):
     """
     Implementace Firefly Algorithm (FA).
+    Vzdálenosti i porovnání jasu se počítají pro celou populaci najednou (broadcasting),
+    nová populace se vyhodnotí jedním dávkovým voláním.
 
     Args:
         function: instance třídy Function (např. Ackley)
@@ -21,78 +29,74 @@ def firefly_algorithm(function, pop_size=20, alpha=0.3, beta_0=1.0, max_gen=50):
         alpha (float): Parametr náhodného pohybu[cite: 145].
         beta_0 (float): Základní atraktivita při r=0[cite: 138].
         max_gen (int): Maximální počet generací.
+        rule (str): "first" = světluška se přiblíží k první jasnější světlušce (původní varianta),
+                    "all" = kanonické FA, přitahují ji všechny jasnější světlušky (součet).
+        record_history (bool): Ukládat populaci pro vizualizaci (viz core.history.HistoryRecorder).
+        history_every (int): Ukládat jen každou history_every-tou generaci.
+        dtype: Datový typ pozic (None = globální výchozí, viz core.precision).
 
     Returns:
         tuple: (best_pos, best_fit, history)
                best_pos: Pozice nejlepší nalezené světlušky.
                best_fit: Fitness nejlepší nalezené světlušky.
-               history: Seznam populací v každé generaci pro vizualizaci.
+               history: Populace v každé generaci pro vizualizaci (HistoryRecorder: pole positions
+                        (G, pop_size, D) a fitness (G, pop_size), history[g] = [(x, f), ...]).
     """
+    if rule not in ("first", "all"):
+        raise ValueError(f"Neznámé pravidlo přitažlivosti: {rule!r} (povoleno 'first' nebo 'all')")
+
     dim = function.dimension
     lower = function.lower_bound
     upper = function.upper_bound
+    dtype = resolve_dtype(dtype)
 
     # --- 1. Inicializace ---
-    population = [Firefly(dim, lower, upper) for _ in range(pop_size)]
-    for ff in population:
-        ff.fitness = function.evaluate(ff.position)
+    positions = random_uniform(lower, upper, (pop_size, dim), dtype)
+    fitness = function.evaluate_batch(positions)
 
     # Najdeme nejlepší
-    gBest = min(population, key=lambda f: f.fitness)
-    best_pos = gBest.position.copy()
-    best_fit = gBest.fitness
+    best_idx = np.argmin(fitness)
+    best_pos = positions[best_idx].copy()
+    best_fit = fitness[best_idx]
 
-    history = [[(ff.position.copy(), ff.fitness) for ff in population]]
+    history = HistoryRecorder(max_gen, pop_size, dim, every=history_every, dtype=dtype,
+                              enabled=record_history)
+    history.record(positions, fitness)
+
+    rows = np.arange(pop_size)
 
     # --- 2. Hlavní cyklus algoritmu ---
     for gen in range(max_gen - 1):
-        new_population = deepcopy(population)
-
-        # Projdeme každou světlušku 'i'
-        for i in range(pop_size):
-            moved = False
-            # Porovnáme ji s každou světluškou 'j'
-            for j in range(pop_size):
-
-                if population[j].fitness < population[i].fitness:
-                    r = np.linalg.norm(population[i].position - population[j].position)
-
-                    # Vypočítáme atraktivitu
-                    beta = beta_0 / (1.0 + r)
-                    attraction = beta * (population[j].position - population[i].position)
-
-                    # Složka náhodného pohybu
-                    random_step = alpha * (np.random.normal(0, 1, size=dim))
-
-                    # Vypočet nové pozice
-                    new_pos = population[i].position + attraction + random_step
-                    new_pos = np.clip(new_pos, lower, upper)
-
-                    # Uložíme do nové populace
-                    new_population[i].position = new_pos
-                    new_population[i].fitness = function.evaluate(new_pos)
-                    moved = True
-
-                    break
-
-            if not moved:
-                random_step = alpha * (np.random.normal(0, 1, size=dim))
-                new_pos = population[i].position + random_step
-                new_pos = np.clip(new_pos, lower, upper)
-
-                new_population[i].position = new_pos
-                new_population[i].fitness = function.evaluate(new_pos)
-
-        # Aktualizujeme populaci
-        population = new_population
+        # brighter[i, j] = světluška j je jasnější (lepší) než i
+        brighter = fitness[None, :] < fitness[:, None]
+
+        if rule == "first":
+            # první jasnější světluška j pro každé i (pokud existuje) – stačí N vzdáleností k ní
+            j = np.argmax(brighter, axis=1)
+            moved = brighter[rows, j]
+            diff = positions[j] - positions
+            beta = beta_0 / (1.0 + np.linalg.norm(diff, axis=1))
+            attraction = (beta * moved)[:, None] * diff
+        else:
+            # sum_j w_ij (x_j - x_i) s atraktivitou pro všechny dvojice
+            diff, r = _pairwise_differences(positions)
+            weights = beta_0 / (1.0 + r) * brighter
+            attraction = np.einsum("ij,ijd->id", weights, diff)
+
+        # Složka náhodného pohybu
+        random_step = alpha * random_normal(0, 1, (pop_size, dim), dtype)
+
+        # Vypočet nových pozic a jejich vyhodnocení
+        positions = np.clip(positions + attraction + random_step, lower, upper)
+        fitness = function.evaluate_batch(positions)
 
         # Najdeme a uložíme nejlepší
-        current_best_ff = min(population, key=lambda f: f.fitness)
-        if current_best_ff.fitness < best_fit:
-            best_fit = current_best_ff.fitness
-            best_pos = current_best_ff.position.copy()
+        current_best = np.argmin(fitness)
+        if fitness[current_best] < best_fit:
+            best_fit = fitness[current_best]
+            best_pos = positions[current_best].copy()
 
         # Uložíme historii pro vizualizaci
-        history.append([(ff.position.copy(), ff.fitness) for ff in population])
+        history.record(positions, fitness)
 
-    return best_pos, best_fit, history
\ No newline at end of file
+    return best_pos, best_fit, history
@@ -1,27 +1,38 @@
 import numpy as np
+from algorithms.tsp_local_search import LocalSearch
+from core.distance_matrix import DistanceMatrix
+
+
+def _tour_distances(cities):
+    """Pro pár délek cest nemá smysl stavět matici n², stačí vzdálenosti hran ze souřadnic (líná matice)."""
+    if isinstance(cities, DistanceMatrix):
+        return cities
+    return DistanceMatrix(cities, lazy=True)
 
 
 def calculate_distance(route, cities):
-    dist = 0.0
-    for i in range(len(route)):
-        city_a = cities[route[i]]
-        city_b = cities[route[(i + 1) % len(route)]]
-        dist += np.linalg.norm(city_a - city_b)
-    return dist
+    return _tour_distances(cities).tour_length(route)
+
+
+def calculate_distances(population, cities):
+    """Délky všech cest v matici (NP, n) najednou."""
+    return _tour_distances(cities).tour_lengths(population)
 
 
 def ordered_crossover(parent1, parent2):
+    """OX v O(n): úsek z parent1, zbytek v pořadí z parent2 (použitá města značí bool maska)."""
+    parent1 = np.asarray(parent1)
+    parent2 = np.asarray(parent2)
     size = len(parent1)
-    start, end = sorted(np.random.choice(range(size), 2, replace=False))
-    child = [-1] * size
+    start, end = sorted(np.random.choice(size, 2, replace=False))
+    child = np.empty_like(parent1)
     child[start:end] = parent1[start:end]
 
-    fill_values = [c for c in parent2 if c not in child]
-    j = 0
-    for i in range(size):
-        if child[i] == -1:
-            child[i] = fill_values[j]
-            j += 1
+    in_child = np.zeros(size, dtype=bool)
+    in_child[parent1[start:end]] = True
+    fill_values = parent2[~in_child[parent2]]
+    child[:start] = fill_values[:start]
+    child[end:] = fill_values[start:]
     return child
 
 
@@ -32,42 +43,57 @@ def mutate(route):
     return route
 
 
-def genetic_tsp(cities, NP=20, G=200):
+def genetic_tsp(cities, NP=20, G=200, local_search=None, ls_max_moves=None, ls_time_limit=None):
     """
     Genetický algoritmus pro TSP.
+    Cesty jsou řádky celočíselné matice (NP, n). Délky všech potomků generace
+    se počítají přesně jedním dávkovým voláním tour_lengths() (žádné sčítání
+    delt, které by se mohlo odchýlit od skutečné délky), délka rodiče se
+    pamatuje do jeho nahrazení.
+
+    cities: souřadnice měst (n, 2) nebo sdílená DistanceMatrix
+    local_search: volitelné lokální zlepšení každého potomka (memetický GA):
+                  "2opt", "oropt" nebo "2opt+oropt"
+    ls_max_moves, ls_time_limit: limit tahů / čas [s] lokálního hledání na jednoho potomka
     """
-    D = len(cities)
-    population = [np.random.permutation(D).tolist() for _ in range(NP)]
-    distances = np.array([calculate_distance(ind, cities) for ind in population])
+    dist = DistanceMatrix.for_cities(cities)
+    D = len(dist)
+    population = np.array([np.random.permutation(D) for _ in range(NP)])
+    distances = dist.tour_lengths(population)
+
+    # Lokální hledání se seznamy nejbližších sousedů – připraví se jednou pro celý běh
+    if local_search is not None:
+        neighbors, _ = dist.nearest_neighbors(8)
+        improver = LocalSearch(dist, neighbors, local_search, ls_max_moves, ls_time_limit)
 
     history = []
     best_idx = np.argmin(distances)
-    best_route = population[best_idx]
+    best_route = population[best_idx].tolist()
     best_distance = distances[best_idx]
     history.append((best_route.copy(), best_distance))
 
     for _ in range(G):
-        new_population = population.copy()
+        offspring = np.empty_like(population)
 
         for j in range(NP):
             parent_A = population[j]
-            idx_B = np.random.choice([k for k in range(NP) if k != j])
+            idx_B = (j + np.random.randint(1, NP)) % NP
             parent_B = population[idx_B]
 
-            offspring_AB = ordered_crossover(parent_A, parent_B)
-            offspring_AB = mutate(offspring_AB)
-
-            f_offspring = calculate_distance(offspring_AB, cities)
-            f_parentA = calculate_distance(parent_A, cities)
+            offspring_AB = mutate(ordered_crossover(parent_A, parent_B))
 
-            if f_offspring < f_parentA:
-                new_population[j] = offspring_AB
+            if local_search is not None:
+                offspring_AB, _ = improver.improve(offspring_AB)
+            offspring[j] = offspring_AB
 
-        population = new_population
-        distances = np.array([calculate_distance(ind, cities) for ind in population])
+        # délky rodičů jsou uložené z předchozích generací
+        offspring_distances = dist.tour_lengths(offspring)
+        replace = offspring_distances < distances
+        population = np.where(replace[:, np.newaxis], offspring, population)
+        distances = np.where(replace, offspring_distances, distances)
 
         best_idx = np.argmin(distances)
-        best_route = population[best_idx]
+        best_route = population[best_idx].tolist()
         best_distance = distances[best_idx]
 
         # uložíme nejlepší
@@ -1,51 +1,73 @@
 import numpy as np
+from core.precision import resolve_dtype, random_uniform, random_normal
+from core.registry import register
+from core.history import HistoryRecorder
 
 
-def hill_climbing(func, iterations=500, neighbors=8, step_size=0.1):
+@register("HC", iterations_param="iterations",
+          evaluations_per_iteration=lambda p: p["climbers"] * p["neighbors"], record_history=False)
+def hill_climbing(func, iterations=500, neighbors=8, step_size=0.1, climbers=1, record_history=True,
+                  history_every=1, dtype=None):
     """
-    Hill Climbing algoritmus.
+    Hill Climbing algoritmus (volitelně multi-start).
+
+    Všech `climbers` horolezců postupuje současně: jejich sousedé se vygenerují,
+    ořežou a vyhodnotí jednou dávkou a akceptace se provede maticově.
 
     Args:
         func: instance testovací funkce (musí mít .evaluate(), .lower_bound, .upper_bound, .dimension)
         iterations: maximální počet iterací
         neighbors: kolik sousedů generovat v každém kroku
         step_size: směrodatná odchylka pro generování sousedů (normal distribution)
+        climbers: počet nezávislých horolezců (náhodných startů)
+        record_history: ukládat trajektorii (viz core.history.HistoryRecorder)
+        history_every: ukládat jen každý history_every-tý krok
+        dtype: datový typ pozic (None = globální výchozí, viz core.precision)
 
     Returns:
         best_x: nejlepší nalezený vektor parametrů
         best_f: hodnota funkce v best_x
-        history: seznam všech navštívených bodů [(x, f), ...]
+        history: HistoryRecorder navštívených bodů (chová se jako seznam [(x, f), ...]) –
+                 v každé iteraci aktuální bod nejlepšího horolezce
     """
-    # start: náhodné řešení
-    x_current = np.random.uniform(func.lower_bound, func.upper_bound, func.dimension)
-    f_current = func.evaluate(x_current)
+    dtype = resolve_dtype(dtype)
+    dim = func.dimension
+    rows = np.arange(climbers)
+
+    # start: náhodná řešení (jedno pro každého horolezce)
+    x_current = random_uniform(func.lower_bound, func.upper_bound, (climbers, dim), dtype)
+    f_current = func.evaluate_batch(x_current)
 
-    best_x, best_f = x_current, f_current
-    history = [(x_current, f_current)]
+    k = np.argmin(f_current)
+    best_x, best_f = x_current[k].copy(), f_current[k]
+    history = HistoryRecorder(iterations + 1, None, dim, every=history_every, dtype=dtype,
+                              enabled=record_history)
+    history.record(best_x, best_f)
 
     for _ in range(iterations):
-        # generování sousedů (NP sousedů kolem x_current)
-        neighbors_x = np.random.normal(loc=x_current, scale=step_size,
-                                       size=(neighbors, func.dimension))
+        # generování sousedů (neighbors sousedů kolem každého x_current)
+        neighbors_x = random_normal(x_current[:, np.newaxis, :], step_size, (climbers, neighbors, dim),
+                                    dtype)
 
         # udržet v doméně funkce
         neighbors_x = np.clip(neighbors_x, func.lower_bound, func.upper_bound)
 
-        # vyhodnocení sousedů
-        values = [func.evaluate(x) for x in neighbors_x]
+        # vyhodnocení sousedů všech horolezců jednou dávkou
+        values = func.evaluate_batch(neighbors_x.reshape(-1, dim)).reshape(climbers, neighbors)
 
-        # najít nejlepšího souseda
-        idx_best = np.argmin(values)
-        x_best_neighbor = neighbors_x[idx_best]
-        f_best_neighbor = values[idx_best]
+        # najít nejlepšího souseda každého horolezce
+        idx_best = np.argmin(values, axis=1)
+        f_best_neighbor = values[rows, idx_best]
 
-        # aktualizace
-        if f_best_neighbor < f_current:
-            x_current, f_current = x_best_neighbor, f_best_neighbor
+        # aktualizace (jen horolezci, kteří se zlepšili)
+        accept = f_best_neighbor < f_current
+        x_current[accept] = neighbors_x[rows[accept], idx_best[accept]]
+        f_current[accept] = f_best_neighbor[accept]
 
-            if f_best_neighbor < best_f:
-                best_x, best_f = x_best_neighbor, f_best_neighbor
+        k = np.argmin(f_current)
+        if f_current[k] < best_f:
+            best_x, best_f = x_current[k].copy(), f_current[k]
 
-        history.append((x_current, f_current))
+        history.record(x_current[k], f_current[k])
 
     return best_x, best_f, history
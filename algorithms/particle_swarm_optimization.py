@@ -1,79 +1,106 @@
 import numpy as np
-from copy import deepcopy
+from core.precision import resolve_dtype, random_uniform, random_rand
+from core.registry import register
+from core.history import HistoryRecorder
 
 
-class Particle:
-    """Reprezentace jedné částice ve swarmu (pro PSO)."""
-    def __init__(self, dimension, lower_bound, upper_bound):
-        self.dimension = dimension
-        self.position = np.random.uniform(lower_bound, upper_bound, dimension)
-        self.velocity = np.random.uniform(-abs(upper_bound - lower_bound),
-                                          abs(upper_bound - lower_bound), dimension) * 0.1
-        self.best_position = self.position.copy()
-        self.f = None
-        self.best_f = np.inf
-
-
-def particle_swarm_optimization(function, pop_size=15, c1=2.0, c2=2.0, w=0.7, M_max=50):
+@register("PSO", iterations_param="M_max", evaluations_per_iteration=lambda p: p["pop_size"],
+          record_history=False)
+def particle_swarm_optimization(function, pop_size=15, c1=2.0, c2=2.0, w=0.7, M_max=50,
+                                synchronous=True, record_history=True, history_every=1, dtype=None):
     """
     Particle Swarm Optimization (PSO) s inertia weight.
+    Swarm je uložen jako matice pozic, rychlostí a osobních optim (pop_size, D).
     :param function: instance třídy Function (např. Griewank)
     :param pop_size: počet částic
     :param c1, c2: akcelerační koeficienty (kognitivní a sociální složka)
     :param w: setrvačnost (inertia weight)
     :param M_max: maximální počet iterací
-    :return: nejlepší nalezené řešení, jeho fitness, historie (populace v každé iteraci)
+    :param synchronous: True = celý swarm se posune najednou a vyhodnotí jednou dávkou,
+                        gBest se aktualizuje až po iteraci; False = původní asynchronní
+                        varianta (gBest se mění hned po každé částici)
+    :param record_history: ukládat populace pro vizualizaci (viz core.history.HistoryRecorder)
+    :param history_every: ukládat jen každou history_every-tou iteraci
+    :param dtype: datový typ pozic a rychlostí (None = globální výchozí, viz core.precision)
+    :return: nejlepší nalezené řešení, jeho fitness, historie populací (HistoryRecorder:
+             pole positions (M, pop_size, D) a fitness (M, pop_size), history[m] = [(x, f), ...])
     """
     dim = function.dimension
     lower, upper = function.lower_bound, function.upper_bound
+    dtype = resolve_dtype(dtype)
+
+    # hranice rychlosti
+    span = abs(upper - lower)
+    v_min, v_max = -span * 0.2, span * 0.2
 
     # inicializace swarmu
-    swarm = [Particle(dim, lower, upper) for _ in range(pop_size)]
-    for p in swarm:
-        p.f = function.evaluate(p.position)
-        p.best_f = p.f
-        p.best_position = p.position.copy()
+    positions = random_uniform(lower, upper, (pop_size, dim), dtype)
+    velocities = random_uniform(-span, span, (pop_size, dim), dtype)
+    velocities *= 0.1
+    values = function.evaluate_batch(positions)
+
+    best_positions = positions.copy()
+    best_values = values.copy()
 
     # globálně nejlepší částice
-    gBest = min(swarm, key=lambda p: p.f)
-    gBest_position = gBest.position.copy()
-    gBest_value = gBest.f
+    g = np.argmin(values)
+    gBest_position = positions[g].copy()
+    gBest_value = values[g]
 
-    history = [[(p.position.copy(), p.f) for p in swarm]]
+    history = HistoryRecorder(M_max, pop_size, dim, every=history_every, dtype=dtype, enabled=record_history)
+    history.record(positions, values)
 
     # hlavní iterace
     for m in range(M_max - 1):
-        for i, p in enumerate(swarm):
-            r1, r2 = np.random.rand(dim), np.random.rand(dim)
-
-            # aktualizace rychlosti
-            v_new = (
-                w * p.velocity
-                + c1 * r1 * (p.best_position - p.position)
-                + c2 * r2 * (gBest_position - p.position)
+        r1 = random_rand((pop_size, dim), dtype)
+        r2 = random_rand((pop_size, dim), dtype)
+
+        if synchronous:
+            # aktualizace rychlostí a pozic celého swarmu
+            velocities = (
+                w * velocities
+                + c1 * r1 * (best_positions - positions)
+                + c2 * r2 * (gBest_position - positions)
             )
-
-            # kontrola hranic rychlosti
-            v_min, v_max = -abs(upper - lower) * 0.2, abs(upper - lower) * 0.2
-            p.velocity = np.clip(v_new, v_min, v_max)
-
-            # aktualizace pozice
-            p.position = np.clip(p.position + p.velocity, lower, upper)
-
-            # vyhodnocení nové pozice
-            p.f = function.evaluate(p.position)
-
-            # aktualizace osobního i globálního optima
-            if p.f < p.best_f:
-                p.best_f = p.f
-                p.best_position = p.position.copy()
-
-                if p.f < gBest_value:
-                    gBest_value = p.f
-                    gBest_position = p.position.copy()
+            velocities = np.clip(velocities, v_min, v_max)
+            positions = np.clip(positions + velocities, lower, upper)
+
+            # vyhodnocení všech nových pozic jednou dávkou
+            values = function.evaluate_batch(positions)
+
+            # aktualizace osobních i globálního optima
+            improved = values < best_values
+            best_positions[improved] = positions[improved]
+            best_values[improved] = values[improved]
+
+            g = np.argmin(best_values)
+            if best_values[g] < gBest_value:
+                gBest_value = best_values[g]
+                gBest_position = best_positions[g].copy()
+        else:
+            for i in range(pop_size):
+                # aktualizace rychlosti
+                v_new = (
+                    w * velocities[i]
+                    + c1 * r1[i] * (best_positions[i] - positions[i])
+                    + c2 * r2[i] * (gBest_position - positions[i])
+                )
+                velocities[i] = np.clip(v_new, v_min, v_max)
+
+                # aktualizace pozice a vyhodnocení
+                positions[i] = np.clip(positions[i] + velocities[i], lower, upper)
+                values[i] = function.evaluate(positions[i])
+
+                # aktualizace osobního i globálního optima
+                if values[i] < best_values[i]:
+                    best_values[i] = values[i]
+                    best_positions[i] = positions[i]
+
+                    if values[i] < gBest_value:
+                        gBest_value = values[i]
+                        gBest_position = positions[i].copy()
 
         # uložit celou populaci do historie
-        generation_data = [(p.position.copy(), p.f) for p in swarm]
-        history.append(generation_data)
+        history.record(positions, values)
 
     return gBest_position, gBest_value, history
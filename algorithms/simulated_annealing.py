@@ -1,57 +1,113 @@
+import math
 import numpy as np
+from core.precision import resolve_dtype, random_uniform, random_normal
+from core.registry import register
+from core.history import HistoryRecorder
 
 
-def simulated_annealing(func, iterations=500, T0=100, Tmin=0.5, alpha=0.95):
+def _replica_exchange(x, f, temperatures, offset):
+    """
+    Výměna stavů mezi sousedními teplotami (k, k+1) pro k = offset, offset+2, ...
+    Přijetí s pravděpodobností min(1, exp((1/T_k - 1/T_k+1) * (f_k - f_k+1))).
+    """
+    k = np.arange(offset, len(temperatures) - 1, 2)
+    if len(k) == 0:
+        return
+    arg = (1.0 / temperatures[k] - 1.0 / temperatures[k + 1]) * (f[k] - f[k + 1])
+    swap = np.random.rand(len(k)) < np.exp(np.minimum(arg, 0.0))
+    a, b = k[swap], k[swap] + 1
+    x[a], x[b] = x[b].copy(), x[a].copy()
+    f[a], f[b] = f[b].copy(), f[a].copy()
+
+
+@register("SA", iterations_param="iterations", evaluations_per_iteration=lambda p: p["chains"],
+          record_history=False)
+def simulated_annealing(func, iterations=500, T0=100, Tmin=0.5, alpha=0.95, chains=1,
+                        tempering=False, exchange_every=1, record_history=True, history_every=1, dtype=None):
     """
     Simulated Annealing (SA) pro libovolnou funkci.
 
+    Běží `chains` nezávislých řetězců najednou – návrhy všech řetězců se v každém
+    kroku vyhodnotí jednou dávkou. Místo všech návrhů se ukládá jen průběh
+    nejlepšího dosud nalezeného řešení.
+
     Args:
         func: instance testovací funkce (musí mít .evaluate(), .lower_bound, .upper_bound, .dimension)
         T0: počáteční teplota
         Tmin: minimální teplota (stop podmínka)
         alpha: chladicí koeficient (0 < alpha < 1)
         max_iter: maximální počet iterací (bez ohledu na Tmin)
+        chains: počet řetězců běžících současně
+        tempering: True = parallel tempering – řetězce mají pevný žebříček teplot
+                   (geometricky mezi Tmin a T0), neochlazují se a každých
+                   `exchange_every` kroků si sousední teploty zkusí vyměnit stavy;
+                   vyžaduje chains >= 2 (jediný řetězec by běžel jen při Tmin)
+        exchange_every: perioda výměn při parallel tempering
+        record_history: ukládat průběh nejlepšího řešení (viz core.history.HistoryRecorder)
+        history_every: ukládat jen každý history_every-tý krok
+        dtype: datový typ pozic (None = globální výchozí, viz core.precision)
 
     Returns:
         best_x: nejlepší nalezený vektor parametrů
         best_f: hodnota funkce v best_x
-        history: seznam všech navštívených bodů [(x, f), ...]
+        history: průběh nejlepšího řešení po každém kroku (HistoryRecorder, chová se jako [(best_x, best_f), ...])
         :param func:
         :param alpha:
         :param Tmin:
         :param T0:
         :param iterations:
     """
+    if tempering and chains < 2:
+        raise ValueError(f"Parallel tempering potřebuje aspoň 2 řetězce, zadáno chains={chains}")
+
     # inicializace
-    T = T0
-    x = np.random.uniform(func.lower_bound, func.upper_bound, func.dimension)
-    f = func.evaluate(x)
+    dtype = resolve_dtype(dtype)
+    dim = func.dimension
+    x = random_uniform(func.lower_bound, func.upper_bound, (chains, dim), dtype)
+    f = func.evaluate_batch(x)
+
+    if tempering:
+        temperatures = np.geomspace(Tmin, T0, chains)
+    else:
+        T = T0
 
-    best_x, best_f = np.copy(x), f
-    history = [(np.copy(x), f)]
+    k = np.argmin(f)
+    best_x, best_f = x[k].copy(), f[k]
+    # bez tempering skončí chlazení nejpozději po log(Tmin/T0)/log(alpha) krocích – podle toho se předalokuje
+    steps = iterations
+    if not tempering and 0 < alpha < 1 and 0 < Tmin < T0:
+        steps = min(iterations, math.ceil(math.log(Tmin / T0, alpha)) + 1)
+    history = HistoryRecorder(steps + 1, None, dim, every=history_every, dtype=dtype, enabled=record_history)
+    history.record(best_x, best_f)
 
     iteration = 0
-    while T > Tmin and iteration < iterations:
-        # vygeneruj souseda
-        x_new = x + np.random.normal(0, 1, func.dimension)
+    while (tempering or T > Tmin) and iteration < iterations:
+        # vygeneruj sousedy všech řetězců
+        x_new = x + random_normal(0, 1, (chains, dim), dtype)
         # ořež do domény
         x_new = np.clip(x_new, func.lower_bound, func.upper_bound)
 
-        f_new = func.evaluate(x_new)
-        history.append((np.copy(x_new), f_new))
+        f_new = func.evaluate_batch(x_new)
 
-        # akceptační kritérium
-        if f_new < f:
-            x, f = x_new, f_new
-            if f_new < best_f:
-                best_x, best_f = np.copy(x_new), f_new
-        else:
-            r = np.random.rand()
-            if r < np.exp(-(f_new - f) / T):
-                x, f = x_new, f_new
+        # akceptační kritérium (lepší vždy, horší s pravděpodobností exp(-Δf / T))
+        T_current = temperatures if tempering else T
+        delta = np.maximum(f_new - f, 0)
+        accept = np.random.rand(chains) < np.exp(-delta / T_current)
+        x[accept] = x_new[accept]
+        f[accept] = f_new[accept]
+
+        k = np.argmin(f_new)
+        if f_new[k] < best_f:
+            best_x, best_f = x_new[k].copy(), f_new[k]
+        history.record(best_x, best_f)
 
-        # ochlazování
-        T *= alpha
         iteration += 1
+        if tempering:
+            # výměna replik mezi sousedními teplotami (střídavě sudé a liché páry)
+            if iteration % exchange_every == 0:
+                _replica_exchange(x, f, temperatures, (iteration // exchange_every) % 2)
+        else:
+            # ochlazování
+            T *= alpha
 
     return best_x, best_f, history
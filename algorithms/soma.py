@@ -1,79 +1,78 @@
 import numpy as np
-from copy import deepcopy
+from core.precision import resolve_dtype, random_uniform
+from core.registry import register
+from core.history import HistoryRecorder
 
 
-class Individual:
-    """Reprezentace jednoho jedince pro SOMA All-to-One."""
-    def __init__(self, dimension, lower_bound, upper_bound):
-        self.dimension = dimension
-        self.position = np.random.uniform(lower_bound, upper_bound, dimension)
-        self.fitness = None
-
-
-def soma_all_to_one(function, pop_size=20, PRT=0.4, path_length=3.0, step=0.11, M_max=100):
+# každý jedinec kromě lídra vyhodnotí v migraci aspoň první krok cesty (jedinci splývající
+# s lídrem se nehýbou – pak běh skončí po M_max migracích dřív, než vyčerpá rozpočet)
+@register("SOMA", iterations_param="M_max", evaluations_per_iteration=lambda p: p["pop_size"] - 1,
+          record_history=False)
+def soma_all_to_one(function, pop_size=20, PRT=0.4, path_length=3.0, step=0.11, M_max=100,
+                    record_history=True, history_every=1, dtype=None):
     """
     SOMA All-to-One (Self-Organizing Migrating Algorithm)
     Implementace podle prezentace prof. Zelinky (09c BIA – Algorithms.pptx)
+    Všechny pozice na cestách všech jedinců k lídrovi jsou známé předem, proto se
+    celá migrace sestaví jako tensor (jedinci × kroky × D) a vyhodnotí jednou dávkou.
+    record_history, history_every: ukládat populaci (každou history_every-tou migraci) pro vizualizaci
+    dtype: datový typ pozic (None = globální výchozí, viz core.precision)
+    Vrací (pozice lídra, jeho fitness, history) – history je HistoryRecorder s poli
+    positions (M, pop_size, D) a fitness (M, pop_size), history[m] = [(x, f), ...] migrace m.
     """
     dim = function.dimension
     lower, upper = function.lower_bound, function.upper_bound
+    dtype = resolve_dtype(dtype)
 
     # inicializace populace
-    population = [Individual(dim, lower, upper) for _ in range(pop_size)]
-    for ind in population:
-        ind.fitness = function.evaluate(ind.position)
+    positions = random_uniform(lower, upper, (pop_size, dim), dtype)
+    fitness = function.evaluate_batch(positions)
 
     # historie pro vizualizaci
-    history = [[(ind.position.copy(), ind.fitness) for ind in population]]
-
-    # pomocné funkce
-    def get_leader(pop):
-        return min(pop, key=lambda i: i.fitness)
-
-    def get_prt_vector(prt, dim):
-        """Náhodný binární vektor s pravděpodobností prt."""
-        return np.random.rand(dim) < prt
+    history = HistoryRecorder(M_max + 1, pop_size, dim, every=history_every, dtype=dtype,
+                              enabled=record_history)
+    history.record(positions, fitness)
 
-    def clip_coords(position):
-        return np.clip(position, lower, upper)
+    # kroky t po cestě k lídrovi (stejné pro všechny jedince)
+    steps = np.arange(step, path_length + step, step, dtype=dtype)
 
     # Hlavní cyklus migrací
     for migration in range(M_max):
-        leader = get_leader(population)
+        leader = positions[np.argmin(fitness)].copy()
 
-        for individual in population:
-            # Leader se nehýbe
-            if np.all(individual.position == leader.position):
-                continue
+        # Leader se nehýbe (ani jedinci, kteří s ním splývají)
+        movers = np.flatnonzero(~np.all(positions == leader, axis=1))
 
-            best_pos = individual.position.copy()
-            best_fit = individual.fitness
+        if len(movers) > 0:
+            # Náhodný binární PRT vektor pro každého jedince
+            prt_vectors = np.random.rand(len(movers), dim) < PRT
 
-            prt_vector = get_prt_vector(PRT, dim)
+            # Všechny pozice po krocích směrem k leaderovi: (jedinci, kroky, D)
+            start = positions[movers]
+            direction = (leader - start) * prt_vectors
+            candidates = start[:, None, :] + direction[:, None, :] * steps[None, :, None]
+            candidates = np.clip(candidates, lower, upper)
 
-            # Pohyb po krocích směrem k leaderovi
-            for t in np.arange(step, path_length + step, step):
-                # Výpočet nové pozice
-                pos = individual.position + (leader.position - individual.position) * t * prt_vector
-                pos = clip_coords(pos)
-                fit = function.evaluate(pos)
+            # Pokud jsme na hraně prostoru – přeruš migraci:
+            # krok na hraně se ještě vyhodnotí, všechny další už ne
+            at_edge = np.any(np.abs(candidates) >= upper, axis=2)
+            evaluated = (np.cumsum(at_edge, axis=1) - at_edge) == 0
 
-                # Pokud je lepší – uložit
-                if fit < best_fit:
-                    best_fit = fit
-                    best_pos = pos.copy()
+            # Vyhodnocení všech platných kroků jednou dávkou (počet OFE = evaluated.sum())
+            path_fitness = np.full(evaluated.shape, np.inf, dtype=fitness.dtype)
+            path_fitness[evaluated] = function.evaluate_batch(candidates[evaluated])
 
-                # Pokud jsme na hraně prostoru – přeruš migraci
-                if np.any(np.abs(pos) >= upper):
-                    break
+            # Přesun na nejlepší nalezenou pozici, pokud je lepší než výchozí
+            best_step = np.argmin(path_fitness, axis=1)
+            best_fit = path_fitness[np.arange(len(movers)), best_step]
+            improved = best_fit < fitness[movers]
 
-            # Přesun na nejlepší nalezenou pozici
-            individual.position = best_pos
-            individual.fitness = best_fit
+            positions[movers[improved]] = candidates[improved, best_step[improved]]
+            fitness[movers[improved]] = best_fit[improved]
 
         # Uložit po každé migraci
-        history.append([(ind.position.copy(), ind.fitness) for ind in population])
+        history.record(positions, fitness)
 
     # Výsledek
-    leader = get_leader(population)
-    return leader.position, leader.fitness, history
+    leader_idx = np.argmin(fitness)
+    return positions[leader_idx].copy(), fitness[leader_idx], history
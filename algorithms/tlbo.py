@@ -1,35 +1,56 @@
 import numpy as np
-from copy import deepcopy
+from core.precision import resolve_dtype, random_uniform, random_rand
+from core.registry import register
+from core.history import HistoryRecorder
 
 
-def tlbo(function, population_size=30, max_generations=50):
+# generace = učitelská fáze (population_size evaluací) + fáze žáků (population_size evaluací)
+@register("TLBO", iterations_param="max_generations",
+          evaluations_per_iteration=lambda p: 2 * p["population_size"], record_history=False)
+def tlbo(function, population_size=30, max_generations=50, sequential_learners=False,
+         record_history=False, history_every=1, dtype=None):
     """
     Teaching-Learning Based Optimization (TLBO)
 
+    Obě fáze se počítají maticově pro celou třídu a vyhodnocují jedním dávkovým voláním.
+
     Args:
         function: Testovací funkce (musí mít .evaluate(), .lower_bound, .upper_bound, .dimension)
         population_size (int): Velikost třídy (NP).
         max_generations (int): Počet generací (respektive iterací).
+        sequential_learners (bool): True = learner phase po jednom žákovi s okamžitou
+                                    aktualizací třídy (původní sekvenční varianta).
+        record_history (bool): Ukládat populaci každé generace (pro vizualizaci).
+                               Pole se předalokují, bez záznamu nic nestojí.
+        history_every (int): Ukládat jen každou history_every-tou generaci.
+        dtype: Datový typ populace (None = globální výchozí, viz core.precision).
 
     Returns:
         best_pos: Nejlepší nalezené řešení.
         best_val: Hodnota f(best_pos).
-        history: Historie pro vizualizaci (volitelné).
+        history: HistoryRecorder populací pro vizualizaci – pole positions (G, NP, D)
+                 a fitness (G, NP), history[g] = [(x, f), ...] (prázdný, pokud record_history=False).
     """
     dim = function.dimension
     lower = function.lower_bound
     upper = function.upper_bound
+    dtype = resolve_dtype(dtype)
 
     # 1. Inicializace populace (třídy)
-    population = np.random.uniform(lower, upper, (population_size, dim))
-    fitness = np.array([function.evaluate(ind) for ind in population])
+    population = random_uniform(lower, upper, (population_size, dim), dtype)
+    fitness = function.evaluate_batch(population)
 
     # Uložení globálního optima
     best_idx = np.argmin(fitness)
     best_pos = population[best_idx].copy()
     best_val = fitness[best_idx]
 
-    history = []  # Pokud byste chtěl vizualizaci, sem se ukládá
+    # Předalokovaná historie (generace + počáteční stav)
+    history = HistoryRecorder(max_generations + 1, population_size, dim, every=history_every, dtype=dtype,
+                              enabled=record_history)
+    history.record(population, fitness)
+
+    rows = np.arange(population_size)
 
     for g in range(max_generations):
         # --- TEACHER PHASE ---
@@ -37,54 +58,60 @@ def tlbo(function, population_size=30, max_generations=50):
         mean_population = np.mean(population, axis=0)
 
         # Identifikovat učitele (nejlepší řešení)
-        teacher_idx = np.argmin(fitness)
-        teacher = population[teacher_idx]
+        teacher = population[np.argmin(fitness)]
 
-        for i in range(population_size):
-            # Teaching factor (T_F) je náhodně 1 nebo 2
-            tf = np.random.randint(1, 3)
-            r = np.random.rand(dim)
+        # Teaching factor (T_F) je pro každého žáka náhodně 1 nebo 2
+        tf = np.random.randint(1, 3, size=(population_size, 1)).astype(dtype)
+        r = random_rand((population_size, dim), dtype)
 
-            # Rozdíl mezi učitelem a průměrem
-            difference_mean = r * (teacher - tf * mean_population)
+        # Nové řešení žáků na základě učení od učitele
+        new_population = np.clip(population + r * (teacher - tf * mean_population), lower, upper)
+        new_fitness = function.evaluate_batch(new_population)
 
-            # Nové řešení žáka na základě učení od učitele
-            new_solution = population[i] + difference_mean
-            new_solution = np.clip(new_solution, lower, upper)
-            new_fitness = function.evaluate(new_solution)
-
-            # Akceptace (Greedy selection)
-            if new_fitness < fitness[i]:
-                population[i] = new_solution
-                fitness[i] = new_fitness
+        # Akceptace (Greedy selection)
+        improved = new_fitness < fitness
+        population[improved] = new_population[improved]
+        fitness[improved] = new_fitness[improved]
 
         # --- LEARNER PHASE ---
-        for i in range(population_size):
-            # Vyber náhodného spolužáka j (různého od i)
-            candidates = list(range(population_size))
-            candidates.remove(i)
-            j = np.random.choice(candidates)
-
-            xi = population[i]
-            xj = population[j]
-            fi = fitness[i]
-            fj = fitness[j]
-
-            r = np.random.rand(dim)
-
-            # Interakce mezi žáky
-            if fi < fj:
-                new_solution = xi + r * (xi - xj)
-            else:
-                new_solution = xi + r * (xj - xi)
-
-            new_solution = np.clip(new_solution, lower, upper)
-            new_fitness = function.evaluate(new_solution)
+        if sequential_learners:
+            for i in range(population_size):
+                # Vyber náhodného spolužáka j (různého od i)
+                j = (i + np.random.randint(1, population_size)) % population_size
+
+                xi = population[i]
+                xj = population[j]
+                r = random_rand(dim, dtype)
+
+                # Interakce mezi žáky
+                if fitness[i] < fitness[j]:
+                    new_solution = xi + r * (xi - xj)
+                else:
+                    new_solution = xi + r * (xj - xi)
+
+                new_solution = np.clip(new_solution, lower, upper)
+                new_fitness = function.evaluate(new_solution)
+
+                # Akceptace
+                if new_fitness < fitness[i]:
+                    population[i] = new_solution
+                    fitness[i] = new_fitness
+        else:
+            # Náhodný spolužák j != i pro všechny žáky najednou
+            j = (rows + np.random.randint(1, population_size, size=population_size)) % population_size
+            r = random_rand((population_size, dim), dtype)
+
+            # Interakce mezi žáky: k lepšímu se přibližuji, od horšího se vzdaluji
+            direction = population[j] - population
+            i_is_better = (fitness < fitness[j])[:, None]
+            new_population = population + np.where(i_is_better, -r, r) * direction
+            new_population = np.clip(new_population, lower, upper)
+            new_fitness = function.evaluate_batch(new_population)
 
             # Akceptace
-            if new_fitness < fitness[i]:
-                population[i] = new_solution
-                fitness[i] = new_fitness
+            improved = new_fitness < fitness
+            population[improved] = new_population[improved]
+            fitness[improved] = new_fitness[improved]
 
         # Aktualizace best known
         current_best_idx = np.argmin(fitness)
@@ -92,7 +119,6 @@ def tlbo(function, population_size=30, max_generations=50):
             best_val = fitness[current_best_idx]
             best_pos = population[current_best_idx].copy()
 
-        # (Volitelné) Uložení historie
-        # history.append([(ind.copy(), f) for ind, f in zip(population, fitness)])
+        history.record(population, fitness)
 
-    return best_pos, best_val, history
\ No newline at end of file
+    return best_pos, best_val, history
@@ -0,0 +1,231 @@
+import time
+from collections import deque
+import numpy as np
+from core.distance_matrix import DistanceMatrix
+
+
+def nearest_neighbor_lists(cities, k, block_size=256):
+    """
+    k nejbližších sousedů každého města (seřazeno podle vzdálenosti).
+    cities: souřadnice (n, 2) nebo DistanceMatrix. Vrací (indexy (n, k), vzdálenosti (n, k)).
+    """
+    return DistanceMatrix.for_cities(cities).nearest_neighbors(k, block_size)
+
+
+class _Tour:
+    """
+    Cesta jako Python seznam + pole pozic měst, aby šly zisky tahů počítat v O(1).
+    d: skalární funkce vzdálenosti d(a, b) (viz DistanceMatrix.scalar_distance)
+    """
+    def __init__(self, route, d):
+        self.route = [int(c) for c in route]
+        self.n = len(self.route)
+        self.pos = [0] * self.n
+        for i, c in enumerate(self.route):
+            self.pos[c] = i
+        self.d = d
+
+    def succ(self, c):
+        return self.route[(self.pos[c] + 1) % self.n]
+
+    def pred(self, c):
+        return self.route[self.pos[c] - 1]
+
+    def reverse(self, i, j):
+        """Obrátí úsek route[i..j] (i <= j) a aktualizuje pozice."""
+        route, pos = self.route, self.pos
+        route[i:j + 1] = route[i:j + 1][::-1]
+        for p in range(i, j + 1):
+            pos[route[p]] = p
+
+    def two_opt_move(self, t1, t3):
+        """Odebere hrany (t1, succ t1), (t3, succ t3) a přidá (t1, t3), (succ t1, succ t3)."""
+        i, j = self.pos[t1], self.pos[t3]
+        if i < j:
+            self.reverse(i + 1, j)
+        else:
+            self.reverse(j + 1, i)
+
+    def _write(self, start, cities):
+        """Zapíše města na pozice start, start+1, ... (cyklicky) a aktualizuje pozice."""
+        route, pos, n = self.route, self.pos, self.n
+        for offset, c in enumerate(cities):
+            p = (start + offset) % n
+            route[p] = c
+            pos[c] = p
+
+    def move_segment(self, segment, u, reverse):
+        """
+        Přesune souvislý úsek měst (v pořadí cesty) mezi u a succ(u), volitelně obrácený.
+        Přepíše se jen blok mezi úsekem a místem vložení z kratší strany cyklu,
+        cena je tedy O(len(segment) + vzdálenost vložení), ne O(n).
+        """
+        n, length = self.n, len(segment)
+        start = self.pos[segment[0]]
+        inserted = segment[::-1] if reverse else segment
+        # zbytek cesty za úsekem: R[0] = succ(last), ..., R[n - length - 1] = pred(first); u = R[r]
+        r = (self.pos[u] - start - length) % n
+        if r + 1 <= n - length - 1 - r:
+            # [úsek, R[0..r]] -> [R[0..r], úsek]
+            head = [self.route[(start + length + t) % n] for t in range(r + 1)]
+            self._write(start, head + inserted)
+        else:
+            # [R[r+1..], úsek] -> [úsek, R[r+1..]]
+            tail_start = (start + length + r + 1) % n
+            tail = [self.route[(tail_start + t) % n] for t in range(n - length - r - 1)]
+            self._write(tail_start, inserted + tail)
+
+
+class _Budget:
+    """Omezení lokálního hledání počtem tahů a/nebo časem."""
+    def __init__(self, max_moves=None, time_limit=None):
+        self.moves_left = max_moves
+        self.deadline = None if time_limit is None else time.perf_counter() + time_limit
+
+    def exhausted(self):
+        if self.moves_left is not None and self.moves_left <= 0:
+            return True
+        return self.deadline is not None and time.perf_counter() > self.deadline
+
+    def spend(self):
+        if self.moves_left is not None:
+            self.moves_left -= 1
+
+
+def _improve_city_2opt(tour, a, neighbors, eps):
+    """Zkusí zlepšující 2-opt tah, který přidá hranu (a, c) pro c z kandidátů a. Vrací (zisk, dotčená města)."""
+    for succ_direction in (True, False):
+        a_next = tour.succ(a) if succ_direction else tour.pred(a)
+        d_a = tour.d(a, a_next)
+        for c in neighbors[a]:
+            d_ac = tour.d(a, c)
+            if d_ac >= d_a:
+                break  # seznam je seřazený, další kandidáti už nepomohou
+            c_next = tour.succ(c) if succ_direction else tour.pred(c)
+            if c_next == a:
+                continue
+            gain = d_a + tour.d(c, c_next) - d_ac - tour.d(a_next, c_next)
+            if gain > eps:
+                if succ_direction:
+                    tour.two_opt_move(a, c)
+                else:
+                    tour.two_opt_move(c_next, a_next)
+                return gain, (a, a_next, c, c_next)
+    return 0.0, ()
+
+
+def _improve_city_or_opt(tour, a, neighbors, max_segment, eps):
+    """Zkusí přesunout úsek délky 1..max_segment začínající v a za některého souseda. Vrací (zisk, dotčená města)."""
+    n = tour.n
+    segment = [a]
+    for length in range(1, max_segment + 1):
+        if length > 1:
+            segment.append(tour.succ(segment[-1]))
+        if length > n - 3:
+            break
+        first, last = segment[0], segment[-1]
+        p, q = tour.pred(first), tour.succ(last)
+        removal_gain = tour.d(p, first) + tour.d(last, q) - tour.d(p, q)
+        if removal_gain <= eps:
+            continue
+
+        in_segment = set(segment)
+        for end in (first, last):
+            for c in neighbors[end]:
+                if c in in_segment:
+                    continue
+                if tour.d(end, c) >= removal_gain:
+                    break
+                for u, v in ((c, tour.succ(c)), (tour.pred(c), c)):
+                    if u in in_segment or v in in_segment or u == p:
+                        continue
+                    # vložení mezi u a v: u -> first ... last -> v, nebo obráceně
+                    forward = tour.d(u, first) + tour.d(last, v)
+                    backward = tour.d(u, last) + tour.d(first, v)
+                    add = min(forward, backward) - tour.d(u, v)
+                    gain = removal_gain - add
+                    if gain > eps:
+                        tour.move_segment(list(segment), u, reverse=backward < forward)
+                        return gain, (p, q, u, v, first, last)
+    return 0.0, ()
+
+
+class LocalSearch:
+    """
+    Lokální zlepšování cest TSP (2-opt a/nebo Or-opt) s don't-look bity.
+
+    Pro každé město se zkouší jen tahy přidávající hranu k jeho nejbližším
+    sousedům (neighbors, seřazené podle vzdálenosti). Zisk tahu se počítá
+    v O(1) z dotčených hran, provedení tahu stojí O(délka přepsaného úseku).
+    Města, kolem kterých se nic nezměnilo, se znovu nezkoumají (don't-look bity).
+
+    Skalární vzdálenost a seznamy sousedů se připraví jednou v konstruktoru,
+    instance se pak použije pro všechny cesty běhu (každý potomek GA, každý mravenec ACO).
+
+    Args:
+        cities: np.ndarray (n, 2) souřadnic nebo DistanceMatrix
+        neighbors: matice (n, k) nejbližších sousedů (viz nearest_neighbor_lists)
+        method: "2opt", "oropt" nebo "2opt+oropt"
+        max_moves: maximální počet provedených tahů na jednu cestu (None = bez omezení)
+        time_limit: časový limit v sekundách na jednu cestu (None = bez omezení)
+        max_segment: maximální délka úseku přesouvaného Or-opt tahem
+    """
+    def __init__(self, cities, neighbors, method="2opt+oropt", max_moves=None, time_limit=None,
+                 max_segment=3, eps=1e-10):
+        if method not in ("2opt", "oropt", "2opt+oropt"):
+            raise ValueError(f"Neznámá metoda lokálního hledání: {method!r}")
+        self.d = DistanceMatrix.for_cities(cities).scalar_distance()
+        self.neighbor_lists = np.asarray(neighbors).tolist()
+        self.use_2opt = "2opt" in method
+        self.use_or_opt = "oropt" in method
+        self.max_moves = max_moves
+        self.time_limit = time_limit
+        self.max_segment = max_segment
+        self.eps = eps
+
+    def improve(self, route):
+        """
+        Returns:
+            (route, gain): zlepšená cesta (np.ndarray) a o kolik se zkrátila
+        """
+        tour = _Tour(route, self.d)
+        if tour.n < 5:
+            return np.asarray(route), 0.0
+
+        budget = _Budget(self.max_moves, self.time_limit)
+        queue = deque(tour.route)
+        active = [True] * tour.n
+        total_gain = 0.0
+
+        while queue and not budget.exhausted():
+            a = queue.popleft()
+            active[a] = False
+
+            gain, touched = 0.0, ()
+            if self.use_2opt:
+                gain, touched = _improve_city_2opt(tour, a, self.neighbor_lists, self.eps)
+            if gain == 0.0 and self.use_or_opt:
+                gain, touched = _improve_city_or_opt(tour, a, self.neighbor_lists, self.max_segment, self.eps)
+
+            if gain > 0.0:
+                total_gain += gain
+                budget.spend()
+                # města u změněných hran znovu "probudit"
+                for c in (a,) + touched:
+                    if not active[c]:
+                        active[c] = True
+                        queue.append(c)
+
+        return np.array(tour.route), total_gain
+
+
+def improve_tour(route, cities, neighbors, method="2opt+oropt", max_moves=None, time_limit=None,
+                 max_segment=3, eps=1e-10):
+    """
+    Jednorázové lokální zlepšení jedné cesty (viz LocalSearch).
+    Pro opakované volání v jednom běhu je levnější vytvořit LocalSearch jednou.
+
+    Returns:
+        (route, gain): zlepšená cesta (np.ndarray) a o kolik se zkrátila
+    """
+    return LocalSearch(cities, neighbors, method, max_moves, time_limit, max_segment, eps).improve(route)
@@ -0,0 +1,64 @@
+"""
+Porovnání float64 vs. float32 (core.precision) pro všechny spojité algoritmy.
+
+Pro každý algoritmus se měří propustnost (evaluace za sekundu) a špičková
+alokovaná paměť (tracemalloc) při stejném rozpočtu evaluací.
+Spuštění z kořene repozitáře:  python -m benchmarks.precision
+"""
+import time
+import tracemalloc
+import numpy as np
+
+from core.registry import run_algorithm
+from functions.rastrigin import Rastrigin
+
+DIMENSION = 100
+POP_SIZE = 50
+MAX_OFE = 20000
+SEED = 42
+
+# Algoritmy z registru (core.registry), počet generací nastaví rozpočet MAX_OFE
+ALGORITHMS = {
+    "Blind": {},
+    "HC": {},
+    "SA": {"alpha": 0.9995},
+    "DE": {"NP": POP_SIZE},
+    "PSO": {"pop_size": POP_SIZE},
+    "SOMA": {"pop_size": POP_SIZE},
+    "FA": {"pop_size": POP_SIZE},
+    "TLBO": {"population_size": POP_SIZE},
+}
+
+
+def measure(algorithm, kwargs, dtype):
+    """Vrátí (evaluace za sekundu, špičková paměť v MB) pro jeden běh."""
+    # čas se měří bez tracemalloc, který běh výrazně zpomaluje
+    np.random.seed(SEED)
+    start = time.perf_counter()
+    _, _, _, budget = run_algorithm(algorithm, Rastrigin(dimension=DIMENSION), MAX_OFE, dtype=dtype, **kwargs)
+    elapsed = time.perf_counter() - start
+
+    np.random.seed(SEED)
+    tracemalloc.start()
+    run_algorithm(algorithm, Rastrigin(dimension=DIMENSION), MAX_OFE, dtype=dtype, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return budget.evaluations / elapsed, peak / 2**20
+
+
+def run_precision_benchmark():
+    print(f"=== PRECISION BENCHMARK (D={DIMENSION}, NP={POP_SIZE}, Max_OFE={MAX_OFE}) ===")
+    print(f"{'Algoritmus':<10} {'OFE/s f64':>12} {'OFE/s f32':>12} {'zrychlení':>10}"
+          f" {'MB f64':>9} {'MB f32':>9} {'úspora':>8}")
+    print("-" * 76)
+
+    for name, kwargs in ALGORITHMS.items():
+        speed64, mem64 = measure(name, kwargs, np.float64)
+        speed32, mem32 = measure(name, kwargs, np.float32)
+        print(f"{name:<10} {speed64:>12.0f} {speed32:>12.0f} {speed32 / speed64:>9.2f}x"
+              f" {mem64:>9.2f} {mem32:>9.2f} {1 - mem32 / mem64:>7.0%}")
+
+
+if __name__ == "__main__":
+    run_precision_benchmark()
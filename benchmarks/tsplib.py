@@ -0,0 +1,58 @@
+"""
+GA a ACO na instancích TSPLIB s odchylkou od známého optima.
+
+Optimum se bere z <instance>.opt.tour vedle .tsp souboru, nebo se zadá ručně
+jako instance.tsp=OPTIMUM. Instance se při prvním načtení uloží do binární
+cache (core.tsplib), další běhy už text neparsují.
+Spuštění z kořene repozitáře:  python -m benchmarks.tsplib berlin52.tsp kroA100.tsp=21282
+"""
+import sys
+import time
+import numpy as np
+
+from algorithms.genetic_tsp import genetic_tsp
+from algorithms.ant_colony_optimization import ant_colony_optimization
+from core.tsplib import load_tsplib
+
+SEED = 42
+GENERATIONS = 200
+LOCAL_SEARCH = "2opt+oropt"
+# Nad tímto počtem měst ACO pracuje jen s kandidátními seznamy
+CANDIDATE_THRESHOLD = 500
+CANDIDATE_K = 15
+
+ALGORITHMS = {
+    "GA": lambda instance: genetic_tsp(instance, NP=20, G=GENERATIONS, local_search=LOCAL_SEARCH,
+                                       ls_time_limit=1.0),
+    "ACO": lambda instance: ant_colony_optimization(
+        instance, n_ants=20, n_iterations=GENERATIONS, local_search=LOCAL_SEARCH, ls_time_limit=1.0,
+        candidate_k=CANDIDATE_K if instance.dimension > CANDIDATE_THRESHOLD else None),
+}
+
+
+def run_tsplib_benchmark(specs):
+    print(f"=== TSPLIB BENCHMARK (G={GENERATIONS}, local_search={LOCAL_SEARCH}) ===")
+    print(f"{'Instance':<14} {'n':>7} {'optimum':>10} {'Algoritmus':<10} {'délka':>12} {'gap':>8} {'čas [s]':>9}")
+    print("-" * 76)
+
+    for spec in specs:
+        path, _, optimum = spec.partition("=")
+        instance = load_tsplib(path, optimum=float(optimum) if optimum else None)
+        optimum_text = f"{instance.optimal_length:.0f}" if instance.optimal_length else "?"
+
+        for name, run in ALGORITHMS.items():
+            np.random.seed(SEED)
+            start = time.perf_counter()
+            _, best_distance, _ = run(instance)
+            elapsed = time.perf_counter() - start
+            gap = instance.gap(best_distance)
+            gap_text = f"{gap:.2f}%" if gap is not None else "?"
+            print(f"{instance.name:<14} {instance.dimension:>7} {optimum_text:>10} {name:<10}"
+                  f" {best_distance:>12.0f} {gap_text:>8} {elapsed:>9.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    run_tsplib_benchmark(sys.argv[1:])
@@ -12,8 +12,43 @@ class Function:
         """Potomek musí implementovat vlastní hodnotící funkci"""
         raise NotImplementedError("evaluate() musí být implementováno v potomkovi")
 
+    def evaluate_batch(self, X: np.ndarray) -> np.ndarray:
+        """
+        Vyhodnotí celou matici bodů tvaru (N, D) a vrátí vektor N hodnot.
+        Výchozí implementace volá evaluate() po řádcích, potomek si ji může
+        přepsat vektorizovanou verzí. Vektorizované verze redukují přes
+        poslední osu, takže evaluate() jim předá přímo jeden bod (D,).
+        """
+        X = np.asarray(X)
+        dtype = X.dtype if X.dtype.kind == "f" else float
+        return np.array([self.evaluate(x) for x in X], dtype=dtype)
+
     def ideal_grid_points(self, base_density=50):
         """
         Potomek si to může přepsat, jinak se použije default.
         """
         return base_density
+
+
+class FunctionWrapper(Function):
+    """
+    Obálka kolem jiné testovací funkce (rozpočet evaluací, cache, ...).
+    Všechny ostatní atributy (name, dimension, bounds, viz_bounds, ...)
+    se přeposílají na obalenou funkci, takže ji algoritmy použijí beze změny.
+    """
+    def __init__(self, function):
+        self.function = function
+
+    def __getattr__(self, item):
+        if item == "function":
+            raise AttributeError(item)
+        return getattr(self.function, item)
+
+    def evaluate(self, x: np.ndarray) -> float:
+        return self.function.evaluate(x)
+
+    def evaluate_batch(self, X: np.ndarray) -> np.ndarray:
+        return self.function.evaluate_batch(X)
+
+    def ideal_grid_points(self, base_density=50):
+        return self.function.ideal_grid_points(base_density)
@@ -0,0 +1,156 @@
+import time
+import numpy as np
+from core.base_function import FunctionWrapper
+from core.cache import CachedFunction
+
+
+class BudgetExhausted(Exception):
+    """Vyhozena ve chvíli, kdy je vyčerpán rozpočet evaluací (Max_OFE)."""
+
+
+def convergence_checkpoints(max_evaluations, n=100):
+    """Počty evaluací v 1/n, 2/n, ..., 100 % rozpočtu (rostoucí, bez duplicit)."""
+    fractions = np.arange(1, n + 1) / n
+    return np.unique(np.maximum(1, np.ceil(fractions * max_evaluations).astype(np.int64)))
+
+
+class BudgetedFunction(FunctionWrapper):
+    """
+    Obálka kolem testovací funkce, která počítá evaluace (OFE), měří čas
+    strávený uvnitř evaluate() a hlídá pevný rozpočet evaluací.
+
+    Po vyčerpání rozpočtu vyhodí BudgetExhausted. Dávkové vyhodnocení, které
+    by rozpočet přečerpalo, vyhodnotí jen zbývající počet bodů (zleva) a pak
+    výjimku vyhodí – rozpočet je tedy dodržen přesně. Nejlepší vyhodnocený bod
+    si obálka pamatuje sama, takže výsledek je k dispozici i po přerušení.
+    Hodnoty NaN se do nejlepšího bodu ani křivky nepočítají (bez platné hodnoty zůstává best_f = inf).
+
+    checkpoints: rostoucí počty evaluací (viz convergence_checkpoints), ve kterých
+    se do předalokovaného pole zaznamená nejlepší dosud nalezená hodnota –
+    křivka konvergence bez ukládání celé historie (viz convergence()).
+    """
+    def __init__(self, function, max_evaluations=None, checkpoints=None):
+        super().__init__(function)
+        self.max_evaluations = max_evaluations
+        self.evaluations = 0     # celkový počet evaluací (OFE)
+        self.single_calls = 0    # počet volání evaluate()
+        self.batch_calls = 0     # počet volání evaluate_batch()
+        self.eval_time = 0.0     # čas strávený v obalené funkci [s]
+        self.best_x = None
+        self.best_f = np.inf
+
+        self.checkpoints = None if checkpoints is None else np.asarray(checkpoints, dtype=np.int64)
+        if self.checkpoints is not None:
+            self._best_at_checkpoint = np.full(len(self.checkpoints), np.inf)
+            self._next_checkpoint = 0
+
+    @property
+    def remaining(self):
+        """Počet zbývajících evaluací (None = bez omezení)."""
+        if self.max_evaluations is None:
+            return None
+        return max(self.max_evaluations - self.evaluations, 0)
+
+    @property
+    def exhausted(self):
+        return self.remaining == 0
+
+    def _check_budget(self):
+        if self.exhausted:
+            raise BudgetExhausted(f"Rozpočet {self.max_evaluations} evaluací byl vyčerpán")
+
+    def _record_checkpoints(self, values):
+        """Zapíše best-so-far pro checkpointy, které padnou do právě vyhodnocené dávky (volá se před aktualizací best_f)."""
+        first = self.evaluations - len(values)   # počet evaluací před dávkou
+        k = self._next_checkpoint
+        end = np.searchsorted(self.checkpoints, self.evaluations, side="right")
+        if end > k:
+            running = np.fmin(self.best_f, np.fmin.accumulate(values))   # fmin: NaN se přeskočí
+            self._best_at_checkpoint[k:end] = running[self.checkpoints[k:end] - first - 1]
+            self._next_checkpoint = end
+
+    def convergence(self):
+        """
+        Best-so-far v jednotlivých checkpointech. Checkpointy, kterých běh nedosáhl
+        (algoritmus skončil dřív), mají konečnou nejlepší hodnotu.
+        """
+        if self.checkpoints is None:
+            raise ValueError("Rozpočet byl vytvořen bez checkpoints, křivka konvergence se nezaznamenává")
+        curve = self._best_at_checkpoint.copy()
+        curve[self._next_checkpoint:] = self.best_f
+        return curve
+
+    def evaluate(self, x: np.ndarray) -> float:
+        self._check_budget()
+
+        start = time.perf_counter()
+        f = self.function.evaluate(x)
+        self.eval_time += time.perf_counter() - start
+
+        self.evaluations += 1
+        self.single_calls += 1
+        if self.checkpoints is not None:
+            self._record_checkpoints(np.array([f]))
+        if f < self.best_f:
+            self.best_x, self.best_f = np.array(x, copy=True), f
+        return f
+
+    def evaluate_batch(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X)
+        if len(X) == 0:
+            return np.empty(0)
+        self._check_budget()
+
+        remaining = self.remaining
+        truncated = remaining is not None and len(X) > remaining
+        if truncated:
+            X = X[:remaining]
+
+        start = time.perf_counter()
+        values = self.function.evaluate_batch(X)
+        self.eval_time += time.perf_counter() - start
+
+        self.evaluations += len(X)
+        self.batch_calls += 1
+        if self.checkpoints is not None:
+            self._record_checkpoints(values)
+        # NaN (neplatná evaluace) nesmí vyhrát argmin – nejlepší zůstává nejlepší platný bod
+        idx = np.argmin(np.where(np.isnan(values), np.inf, values))
+        if values[idx] < self.best_f:
+            self.best_x, self.best_f = np.array(X[idx], copy=True), values[idx]
+
+        if truncated:
+            raise BudgetExhausted(f"Rozpočet {self.max_evaluations} evaluací byl vyčerpán")
+        return values
+
+
+def run_with_budget(algorithm, function, max_evaluations, cache_size=None,
+                    count_cache_hits=True, checkpoints=None, **kwargs):
+    """
+    Spustí algoritmus nad funkcí obalenou rozpočtem max_evaluations.
+
+    Algoritmus se zastaví přesně po max_evaluations evaluacích (nebo dřív,
+    pokud skončí sám). Výsledkem je nejlepší bod, který byl kdy vyhodnocen.
+
+    Args:
+        cache_size: velikost LRU cache evaluací (None = bez cache)
+        count_cache_hits: zda se zásahy cache započítávají do rozpočtu
+        checkpoints: počty evaluací pro záznam konvergence (budget.convergence())
+
+    Returns:
+        best_x, best_f, history (None při přerušení), budget (BudgetedFunction se statistikami)
+    """
+    if cache_size is None:
+        budget = objective = BudgetedFunction(function, max_evaluations, checkpoints)
+    elif count_cache_hits:
+        budget = objective = BudgetedFunction(CachedFunction(function, cache_size), max_evaluations, checkpoints)
+    else:
+        budget = BudgetedFunction(function, max_evaluations, checkpoints)
+        objective = CachedFunction(budget, cache_size)
+
+    history = None
+    try:
+        _, _, history = algorithm(objective, **kwargs)
+    except BudgetExhausted:
+        pass
+    return budget.best_x, budget.best_f, history, budget
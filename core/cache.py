@@ -0,0 +1,84 @@
+from collections import OrderedDict
+import numpy as np
+from core.base_function import FunctionWrapper
+
+
+class CachedFunction(FunctionWrapper):
+    """
+    Memoizující obálka kolem testovací funkce s omezenou velikostí (LRU).
+
+    Klíčem je přesný obsah vektoru (bajty + dtype), takže se trefí jen
+    bitově shodné body – typicky body oříznuté np.clip na hranici domény
+    nebo opakované pozice v SOMA. Při překročení maxsize se zahodí
+    nejdéle nepoužitý záznam.
+
+    Zda se zásahy cache započítávají do rozpočtu OFE, určuje pořadí obálek:
+    BudgetedFunction(CachedFunction(f)) počítá každé volání,
+    CachedFunction(BudgetedFunction(f)) jen skutečné evaluace (viz run_with_budget).
+    """
+    def __init__(self, function, maxsize=10000):
+        super().__init__(function)
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._cache = OrderedDict()
+
+    @staticmethod
+    def _key(x):
+        x = np.ascontiguousarray(x)
+        return x.dtype.str, x.tobytes()
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def _store(self, key, f):
+        self._cache[key] = f
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._cache.clear()
+
+    def evaluate(self, x: np.ndarray) -> float:
+        key = self._key(x)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return self._cache[key]
+
+        f = self.function.evaluate(x)
+        self.misses += 1
+        self._store(key, f)
+        return f
+
+    def evaluate_batch(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X)
+        values = np.empty(len(X), dtype=X.dtype if X.dtype.kind == "f" else float)
+
+        # rozdělení na zásahy a chybějící body (duplicity v dávce se vyhodnotí jen jednou)
+        pending = OrderedDict()
+        for i, x in enumerate(X):
+            key = self._key(x)
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                values[i] = self._cache[key]
+                self.hits += 1
+            elif key in pending:
+                pending[key].append(i)
+                self.hits += 1
+            else:
+                pending[key] = [i]
+
+        if pending:
+            first_rows = [rows[0] for rows in pending.values()]
+            new_values = self.function.evaluate_batch(X[first_rows])
+            self.misses += len(first_rows)
+            for (key, rows), f in zip(pending.items(), new_values):
+                values[rows] = f
+                self._store(key, f)
+
+        return values
@@ -0,0 +1,158 @@
+import math
+import numpy as np
+
+# Nad tímto počtem měst se matice implicitně nepředpočítává (n² paměti), vzdálenosti se počítají na požádání
+LAZY_THRESHOLD = 2000
+
+# "EUCLIDEAN" = přesná eukleidovská vzdálenost, ostatní jsou metriky TSPLIB (celočíselné)
+METRICS = ("EUCLIDEAN", "EUC_2D", "CEIL_2D", "ATT", "GEO")
+
+
+def _geo_radians(coords):
+    """TSPLIB GEO: souřadnice DDD.MM (stupně.minuty) -> radiány."""
+    degrees = np.trunc(coords)
+    return 3.141592 * (degrees + 5.0 * (coords - degrees) / 3.0) / 180.0
+
+
+def metric_distances(ca, cb, metric="EUCLIDEAN"):
+    """Vzdálenosti mezi body ca[..., :] a cb[..., :] (stejného tvaru) v dané metrice."""
+    if metric == "GEO":
+        a, b = _geo_radians(ca), _geo_radians(cb)
+        q1 = np.cos(a[..., 1] - b[..., 1])
+        q2 = np.cos(a[..., 0] - b[..., 0])
+        q3 = np.cos(a[..., 0] + b[..., 0])
+        arc = np.arccos(np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0))
+        d = np.floor(6378.388 * arc + 1.0)
+        # np.where, ne přiřazení přes masku – ca, cb můžou být i jednotlivé body (skalární výsledek)
+        return np.where(np.all(ca == cb, axis=-1), 0.0, d)
+
+    squared = np.sum((ca - cb) ** 2, axis=-1)
+    if metric == "EUCLIDEAN":
+        return np.sqrt(squared)
+    if metric == "EUC_2D":
+        return np.floor(np.sqrt(squared) + 0.5)
+    if metric == "CEIL_2D":
+        return np.ceil(np.sqrt(squared))
+    if metric == "ATT":
+        r = np.sqrt(squared / 10.0)
+        t = np.floor(r + 0.5)
+        return np.where(t < r, t + 1.0, t)
+    raise ValueError(f"Neznámá metrika: {metric!r} (povoleno {', '.join(METRICS)})")
+
+
+class DistanceMatrix:
+    """
+    Vzdálenosti mezi městy sdílené všemi TSP algoritmy.
+
+    Matice se staví broadcastingem (volitelně ve float32), pro velké instance
+    může být "líná" – vzdálenosti se pak počítají ze souřadnic jen pro
+    požadované dvojice. Sdílí se předáním jedné instance (nebo TSPInstance, která
+    si své matice drží sama, viz core.tsplib), ne globální cache.
+    Místo souřadnic lze zadat hotovou matici (explicitní instance TSPLIB, viz from_matrix).
+    """
+    def __init__(self, cities, dtype=np.float64, lazy=False, metric="EUCLIDEAN"):
+        if metric not in METRICS:
+            raise ValueError(f"Neznámá metrika: {metric!r} (povoleno {', '.join(METRICS)})")
+        self.cities = np.asarray(cities, dtype=float)
+        self.n = len(self.cities)
+        self.dtype = np.dtype(dtype)
+        self.metric = metric
+        self.lazy = lazy
+        self._matrix = None if lazy else self._build()
+
+    @classmethod
+    def from_matrix(cls, matrix, cities=None, dtype=np.float64):
+        """Obalí hotovou matici (n, n) – např. memory-mapped explicitní instanci TSPLIB."""
+        instance = cls.__new__(cls)
+        instance.cities = None if cities is None else np.asarray(cities, dtype=float)
+        instance.n = len(matrix)
+        instance.dtype = np.dtype(dtype)
+        instance.metric = "EXPLICIT"
+        instance.lazy = False
+        instance._matrix = matrix if matrix.dtype == instance.dtype else matrix.astype(instance.dtype)
+        return instance
+
+    @classmethod
+    def for_cities(cls, cities, dtype=np.float64, lazy=None, metric="EUCLIDEAN"):
+        """
+        Matice pro dané souřadnice měst; hotová DistanceMatrix se vrací beze změny.
+        lazy=None => líná matice pro n > LAZY_THRESHOLD.
+        Objekty s metodou distance_matrix() (např. core.tsplib.TSPInstance) vrací svou
+        sdílenou matici s daným dtype a lazy; metriku určuje instance, jiná než výchozí je chyba.
+        """
+        if hasattr(cities, "distance_matrix"):
+            if metric != "EUCLIDEAN":
+                raise ValueError(f"Metriku určuje instance {cities!r}, nelze ji přepsat na {metric!r}")
+            return cities.distance_matrix(dtype=dtype, lazy=lazy)
+        if isinstance(cities, DistanceMatrix):
+            return cities
+        cities = np.ascontiguousarray(cities, dtype=float)
+        if lazy is None:
+            lazy = len(cities) > LAZY_THRESHOLD
+        return cls(cities, dtype, lazy, metric)
+
+    def _build(self):
+        if self.metric == "EUCLIDEAN":
+            diff = self.cities[:, np.newaxis, :] - self.cities[np.newaxis, :, :]
+            return np.sqrt(np.sum(diff ** 2, axis=2)).astype(self.dtype)
+        return metric_distances(self.cities[:, np.newaxis, :], self.cities[np.newaxis, :, :],
+                                self.metric).astype(self.dtype)
+
+    @property
+    def matrix(self):
+        """Plná matice (n, n); u líné matice se postaví až teď."""
+        if self._matrix is None:
+            self._matrix = self._build()
+            self.lazy = False
+        return self._matrix
+
+    def pair(self, a, b):
+        """Vzdálenosti mezi městy a[i] a b[i] (pole indexů libovolného tvaru)."""
+        if self._matrix is not None:
+            return self._matrix[a, b]
+        return metric_distances(self.cities[a], self.cities[b], self.metric).astype(self.dtype, copy=False)
+
+    def __getitem__(self, index):
+        a, b = index
+        return self.pair(a, b)
+
+    def __len__(self):
+        return self.n
+
+    def scalar_distance(self):
+        """Rychlá funkce d(a, b) -> float pro smyčky v Pythonu (lokální hledání)."""
+        if self._matrix is not None:
+            return self._matrix.item
+        if self.metric != "EUCLIDEAN":
+            return lambda a, b: float(self.pair(a, b))
+        xs, ys = self.cities[:, 0].tolist(), self.cities[:, 1].tolist()
+        return lambda a, b: math.hypot(xs[a] - xs[b], ys[a] - ys[b])
+
+    def tour_lengths(self, tours):
+        """Délky uzavřených cest pro matici cest (N, n) jedním průchodem fancy indexingu."""
+        tours = np.atleast_2d(tours)
+        return np.sum(self.pair(tours, np.roll(tours, -1, axis=1)), axis=1, dtype=np.float64)
+
+    def tour_length(self, route):
+        return self.tour_lengths(np.asarray(route))[0]
+
+    def nearest_neighbors(self, k, block_size=256):
+        """
+        k nejbližších sousedů každého města (seřazeno podle vzdálenosti).
+        Počítá se po blocích řádků, takže paměť je O(block_size * n), ne O(n²).
+        Vrací (indexy (n, k), vzdálenosti (n, k)).
+        """
+        k = min(k, self.n - 1)
+        neighbors = np.empty((self.n, k), dtype=np.intp)
+        distances = np.empty((self.n, k), dtype=self.dtype)
+        all_cities = np.arange(self.n)
+        for start in range(0, self.n, block_size):
+            rows = np.arange(start, min(start + block_size, self.n))
+            d = self.pair(rows[:, np.newaxis], all_cities[np.newaxis, :]).astype(float)
+            d[np.arange(len(rows)), rows] = np.inf
+            nearest = np.argpartition(d, k - 1, axis=1)[:, :k]
+            nearest_d = np.take_along_axis(d, nearest, axis=1)
+            order = np.argsort(nearest_d, axis=1)
+            neighbors[rows] = np.take_along_axis(nearest, order, axis=1)
+            distances[rows] = np.take_along_axis(nearest_d, order, axis=1)
+        return neighbors, distances
@@ -0,0 +1,174 @@
+import os
+import math
+import weakref
+import tempfile
+import numpy as np
+
+# Historie větší než tento limit se místo RAM ukládá do np.memmap souboru
+SPILL_THRESHOLD_MB = 256
+# Předem se alokuje nejvýš tolik, dál pole roste geometricky podle skutečného počtu záznamů
+INITIAL_CAPACITY_MB = 16
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class HistoryRecorder:
+    """
+    Historie běhu algoritmu v předalokovaných polích.
+
+    Populační algoritmy ukládají celé generace: positions (G, NP, D), fitness (G, NP).
+    Trajektorie (HC, SA, blind search) se ukládají jako body: positions (G, D), fitness (G,)
+    – zadává se population_size=None.
+
+    capacity: očekávaný počet generací/bodů – jen odhad, předalokuje se nejvýš
+              INITIAL_CAPACITY_MB a pole se při zaplnění zdvojnásobí (viz _grow),
+              horní mez iterací (např. z rozpočtu) tedy nerezervuje paměť dopředu
+    every: ukládá se jen každá every-tá generace/bod (první vždy)
+    enabled: vypnutý recorder nic neukládá (benchmarky, kde se historie zahazuje)
+    Historie nad SPILL_THRESHOLD_MB jde do np.memmap souboru v spill_dir (None = systémový temp).
+
+    Pro zpětnou kompatibilitu se chová jako dřívější seznam: len(), iterace
+    a history[g] vrací seznam [(x, f), ...] generace, resp. dvojici (x, f) bodu.
+    """
+    def __init__(self, capacity, population_size, dimension, every=1, dtype=np.float64,
+                 enabled=True, spill_dir=None):
+        if every < 1:
+            raise ValueError(f"every musí být >= 1, zadáno {every}")
+        self.every = every
+        self.enabled = enabled
+        self.population_size = population_size
+        self.dimension = dimension
+        self.steps = 0       # počet všech zaznamenávaných kroků (i nevybraných)
+        self._count = 0      # počet skutečně uložených
+        self.spill_path = None
+        self.spill_dir = spill_dir
+        self._spill_files = {}   # část -> finalizer, který smaže její spill soubor
+
+        row_shape = () if population_size is None else (population_size,)
+        row_bytes = int(np.prod(row_shape)) * (dimension + 1) * np.dtype(dtype).itemsize
+        capacity = math.ceil(capacity / every) if enabled else 0
+        capacity = min(capacity, max(INITIAL_CAPACITY_MB * 2**20 // row_bytes, 1))
+        shape = (capacity,) + row_shape
+        self._positions = self._allocate(shape + (dimension,), dtype, spill_dir, "positions")
+        self._fitness = self._allocate(shape, dtype, spill_dir, "fitness")
+        self.capacity = capacity
+
+    def _allocate(self, shape, dtype, spill_dir, part):
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        if nbytes <= SPILL_THRESHOLD_MB * 2**20:
+            # np.empty jen rezervuje paměť, stránky se alokují až při zápisu
+            return np.empty(shape, dtype=dtype)
+        fd, path = tempfile.mkstemp(prefix=f"history_{part}_", suffix=".dat", dir=spill_dir)
+        os.close(fd)
+        self._spill_files[part] = weakref.finalize(self, _remove_file, path)
+        if part == "positions":
+            self.spill_path = path
+        return np.memmap(path, dtype=dtype, mode="w+", shape=shape)
+
+    def _grow(self, needed):
+        """Zaplněná pole se zvětší aspoň na dvojnásobek (amortizovaně O(1) na záznam)."""
+        capacity = max(needed, 2 * self.capacity, 1)
+        for name, part in (("_positions", "positions"), ("_fitness", "fitness")):
+            old = getattr(self, name)
+            old_file = self._spill_files.pop(part, None)
+            new = self._allocate((capacity,) + old.shape[1:], old.dtype, self.spill_dir, part)
+            new[:self._count] = old[:self._count]
+            setattr(self, name, new)
+            # starý memmap se zavře s poslední referencí, jeho soubor se smaže hned
+            del old
+            if old_file is not None:
+                old_file()
+        self.capacity = capacity
+
+    def record(self, positions, fitness):
+        """Uloží jednu generaci (NP, D) a (NP,), resp. jeden bod (D,) a skalár."""
+        step = self.steps
+        self.steps += 1
+        if not self.enabled or step % self.every:
+            return
+        if self._count >= self.capacity:
+            self._grow(self._count + 1)
+        self._positions[self._count] = positions
+        self._fitness[self._count] = fitness
+        self._count += 1
+
+    def record_many(self, positions, fitness):
+        """Uloží po sobě jdoucí body (N, D) a (N,) najednou (jen trajektorie)."""
+        n = len(fitness)
+        first = self.steps
+        self.steps += n
+        if not self.enabled:
+            return
+        # indexy v dávce, které padnou na násobek every
+        selected = np.arange((-first) % self.every, n, self.every)
+        if self._count + len(selected) > self.capacity:
+            self._grow(self._count + len(selected))
+        self._positions[self._count:self._count + len(selected)] = positions[selected]
+        self._fitness[self._count:self._count + len(selected)] = fitness[selected]
+        self._count += len(selected)
+
+    @property
+    def positions(self):
+        """Uložené pozice, tvar (G, NP, D), resp. (G, D) – pohled bez kopie."""
+        return self._positions[:self._count]
+
+    @property
+    def fitness(self):
+        """Uložené hodnoty, tvar (G, NP), resp. (G,)."""
+        return self._fitness[:self._count]
+
+    @property
+    def generations(self):
+        """Pořadová čísla uložených generací/kroků (kvůli every)."""
+        return np.arange(self._count) * self.every
+
+    def __len__(self):
+        return self._count
+
+    def _item(self, g):
+        if self.population_size is None:
+            return self._positions[g], self._fitness[g]
+        return list(zip(self._positions[g], self._fitness[g]))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._item(g) for g in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("index historie mimo rozsah")
+        return self._item(index)
+
+    def __iter__(self):
+        for g in range(self._count):
+            yield self._item(g)
+
+    def __repr__(self):
+        kind = "points" if self.population_size is None else f"population={self.population_size}"
+        return (f"HistoryRecorder({self._count} stored, {kind}, dimension={self.dimension}, "
+                f"every={self.every}, enabled={self.enabled})")
+
+
+def history_arrays(history):
+    """
+    (positions, fitness) z HistoryRecorder bez kopie, nebo převod ze starého
+    formátu – seznamu generací [(x, f), ...] či seznamu bodů (x, f).
+    Prázdná historie (např. běh s 0 iteracemi) dává prázdná pole.
+    """
+    if isinstance(history, HistoryRecorder):
+        return history.positions, history.fitness
+    if len(history) == 0:
+        return np.empty((0, 0)), np.empty(0)
+    first = history[0]
+    if isinstance(first, list):
+        positions = np.array([[x for x, _ in gen] for gen in history])
+        fitness = np.array([[f for _, f in gen] for gen in history])
+    else:
+        positions = np.array([x for x, _ in history])
+        fitness = np.array([f for _, f in history])
+    return positions, fitness
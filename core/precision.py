@@ -0,0 +1,72 @@
+import numpy as np
+
+# Výchozí datový typ populací, rychlostí a historií.
+# float32 je podporovaný "rychlý" režim – poloviční paměť a propustnost dat.
+_default_dtype = np.dtype(np.float64)
+
+
+def set_default_dtype(dtype):
+    """Nastaví globální výchozí dtype pro všechny algoritmy (např. np.float32)."""
+    global _default_dtype
+    _default_dtype = _check_dtype(dtype)
+
+
+def get_default_dtype():
+    return _default_dtype
+
+
+def resolve_dtype(dtype=None):
+    """Vrátí dtype pro jeden běh – explicitně zadaný, jinak globální výchozí."""
+    if dtype is None:
+        return _default_dtype
+    return _check_dtype(dtype)
+
+
+def _check_dtype(dtype):
+    dtype = np.dtype(dtype)
+    if dtype.kind != "f":
+        raise ValueError(f"Podporované jsou jen floating-point typy, ne {dtype}")
+    return dtype
+
+
+# --- Náhodná čísla přímo v cílovém dtype ---
+# np.random (RandomState) umí jen float64, float32 by se generoval do dočasného
+# float64 pole a pak převáděl (dvojí alokace). Generator nad stejným MT19937
+# jako globální np.random umí float32 přímo a np.random.seed() platí i pro něj.
+# Pro float64 se volá původní np.random, proud čísel zůstává beze změny.
+_generator = None
+
+
+def _float32_generator():
+    global _generator
+    bit_generator = np.random.get_bit_generator()
+    if _generator is None or _generator.bit_generator is not bit_generator:
+        _generator = np.random.Generator(bit_generator)
+    return _generator
+
+
+def random_uniform(low, high, size, dtype):
+    """np.random.uniform(low, high, size) v daném dtype."""
+    dtype = np.dtype(dtype)
+    if dtype != np.float32:
+        return np.random.uniform(low, high, size).astype(dtype, copy=False)
+    out = _float32_generator().random(size, dtype=dtype)
+    out *= high - low
+    out += low
+    return out
+
+
+def random_rand(size, dtype):
+    """np.random.rand(*size) v daném dtype."""
+    return random_uniform(0.0, 1.0, size, dtype)
+
+
+def random_normal(loc, scale, size, dtype):
+    """np.random.normal(loc, scale, size) v daném dtype."""
+    dtype = np.dtype(dtype)
+    if dtype != np.float32:
+        return np.random.normal(loc, scale, size).astype(dtype, copy=False)
+    out = _float32_generator().standard_normal(size, dtype=dtype)
+    out *= scale
+    out += loc
+    return out
@@ -0,0 +1,109 @@
+import math
+import inspect
+import pkgutil
+import importlib
+from core.budget import run_with_budget
+
+_REGISTRY = {}
+_loaded = False
+
+
+class AlgorithmSpec:
+    """
+    Popis registrovaného algoritmu.
+
+    iterations_param: název parametru s počtem generací/migrací/iterací
+                      (G, M_max, max_gen, ...) – při běhu s rozpočtem ho nastavuje registr
+    evaluations_per_iteration: funkce (parametry běhu) -> nejmenší počet evaluací,
+                      které spotřebuje jedna iterace (None = 1), viz iterations_for_budget
+    defaults: výchozí parametry pro benchmarky (přebijí výchozí hodnoty funkce)
+    """
+    def __init__(self, name, function, iterations_param, defaults, evaluations_per_iteration=None):
+        self.name = name
+        self.function = function
+        self.iterations_param = iterations_param
+        self.defaults = defaults
+        self.evaluations_per_iteration = evaluations_per_iteration
+
+    def params(self, **overrides):
+        """Výsledné parametry běhu (defaults + overrides), bez počtu iterací."""
+        params = dict(self.defaults, **overrides)
+        params.pop(self.iterations_param, None)
+        return params
+
+    def iterations_for_budget(self, max_evaluations, **params):
+        """
+        Počet iterací, ve kterém běh vyčerpá max_evaluations evaluací, i kdyby každá
+        iterace spotřebovala jen nejmenší počet evaluací (+1 za smyčky typu range(G - 1)).
+        Rozpočet tak běh vždy utne dřív nebo přesně na konci poslední iterace a nic
+        se nealokuje na víc iterací, než kolik jich rozpočet dovolí.
+        """
+        per_iteration = 1
+        if self.evaluations_per_iteration is not None:
+            bound = inspect.signature(self.function).bind_partial(**self.params(**params))
+            bound.apply_defaults()
+            per_iteration = max(int(self.evaluations_per_iteration(bound.arguments)), 1)
+        return math.ceil(max_evaluations / per_iteration) + 1
+
+    def __repr__(self):
+        return f"AlgorithmSpec({self.name!r}, {self.function.__name__}, iterations_param={self.iterations_param!r})"
+
+
+def register(name, iterations_param, evaluations_per_iteration=None, **defaults):
+    """
+    Dekorátor, kterým se algoritmus z algorithms/ přihlásí do registru:
+
+        @register("DE", iterations_param="G", evaluations_per_iteration=lambda p: p["NP"], NP=30)
+        def differential_evolution(function, NP=30, F=0.8, CR=0.9, G=200, dtype=None): ...
+    """
+    def decorator(function):
+        if name in _REGISTRY and _REGISTRY[name].function is not function:
+            raise ValueError(f"Algoritmus {name!r} už je registrovaný ({_REGISTRY[name]!r})")
+        _REGISTRY[name] = AlgorithmSpec(name, function, iterations_param, defaults, evaluations_per_iteration)
+        return function
+    return decorator
+
+
+def _load_algorithms():
+    """Naimportuje (jednou za proces) všechny moduly z algorithms/, aby proběhly jejich @register."""
+    global _loaded
+    if _loaded:
+        return
+    package = importlib.import_module("algorithms")
+    for module in pkgutil.iter_modules(package.__path__):
+        importlib.import_module(f"algorithms.{module.name}")
+    _loaded = True
+
+
+def available_algorithms():
+    """Názvy registrovaných algoritmů."""
+    _load_algorithms()
+    return sorted(_REGISTRY)
+
+
+def get_algorithm(name):
+    _load_algorithms()
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        raise ValueError(f"Neznámý algoritmus: {name!r} (registrované: {', '.join(sorted(_REGISTRY))})") from None
+
+
+def run_algorithm(name, function, max_evaluations, cache_size=None, count_cache_hits=True, checkpoints=None,
+                  **params):
+    """
+    Spustí registrovaný algoritmus s přesným rozpočtem max_evaluations evaluací.
+
+    Počet iterací se odvodí z rozpočtu a velikosti populace (viz
+    AlgorithmSpec.iterations_for_budget) – je to horní mez, běh utne rozpočet
+    (klidně uprostřed generace). Algoritmus s vlastní stop podmínkou (SA při
+    Tmin) může skončit dřív a rozpočet nevyčerpat.
+
+    Returns:
+        stejně jako core.budget.run_with_budget
+    """
+    spec = get_algorithm(name)
+    kwargs = spec.params(**params)
+    kwargs[spec.iterations_param] = spec.iterations_for_budget(max_evaluations, **params)
+    return run_with_budget(spec.function, function, max_evaluations, cache_size=cache_size,
+                           count_cache_hits=count_cache_hits, checkpoints=checkpoints, **kwargs)
@@ -0,0 +1,155 @@
+import json
+import math
+import time
+import hashlib
+import sqlite3
+import numpy as np
+import pandas as pd
+
+
+# Telemetrie běhu ukládaná vedle výsledku (sloupec -> SQL typ)
+TELEMETRY_COLUMNS = {
+    "wall_time": "REAL",            # celkový čas běhu [s]
+    "evaluations": "INTEGER",       # skutečný počet evaluací
+    "evals_per_sec": "REAL",
+    "objective_time": "REAL",       # čas strávený ve vyhodnocení účelové funkce [s]
+    "objective_fraction": "REAL",   # objective_time / wall_time, zbytek je režie algoritmu
+    "peak_memory_mb": "REAL",       # špičková alokovaná paměť (tracemalloc), NULL = neměřeno
+}
+
+# Křivka konvergence jako binární pole: checkpointy (int64 OFE) a best-so-far v nich (float64)
+CURVE_COLUMNS = {
+    "checkpoints": "BLOB",
+    "convergence": "BLOB",
+}
+
+
+def run_key(algorithm, params, function, dimension, max_ofe, seed):
+    """
+    Obsahová adresa jednoho běhu: sha256 přes algoritmus, parametry, funkci,
+    dimenzi, rozpočet a seed. Stejné nastavení => stejný klíč => výsledek se znovu nepočítá.
+    """
+    payload = {
+        "algorithm": f"{algorithm.__module__}.{algorithm.__qualname__}",
+        "params": params,
+        "function": f"{function.__module__}.{function.__qualname__}",
+        "dimension": dimension,
+        "max_ofe": max_ofe,
+        "seed": seed,
+    }
+    text = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ResultStore:
+    """
+    Výsledky jednotlivých běhů v SQLite – každý dokončený běh se zapíše hned,
+    takže přerušený benchmark po restartu pokračuje jen chybějícími běhy.
+    Excel je pouze export z tohoto úložiště.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                " key TEXT PRIMARY KEY,"
+                " function TEXT NOT NULL,"
+                " algorithm TEXT NOT NULL,"
+                " experiment INTEGER NOT NULL,"
+                " dimension INTEGER NOT NULL,"
+                " max_ofe INTEGER NOT NULL,"
+                " params TEXT NOT NULL,"
+                " seed TEXT NOT NULL,"
+                " best_f REAL NOT NULL,"
+                " created REAL NOT NULL)"
+            )
+            # starší úložiště bez sloupců telemetrie a konvergence se jen rozšíří
+            existing = {row[1] for row in self.connection.execute("PRAGMA table_info(runs)")}
+            for column, sql_type in {**TELEMETRY_COLUMNS, **CURVE_COLUMNS}.items():
+                if column not in existing:
+                    self.connection.execute(f"ALTER TABLE runs ADD COLUMN {column} {sql_type}")
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __contains__(self, key):
+        return self.connection.execute("SELECT 1 FROM runs WHERE key = ?", (key,)).fetchone() is not None
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def missing(self, keys, checkpoints=None):
+        """
+        Klíče z keys, pro které ještě není uložený výsledek (v původním pořadí).
+        Běhy ze starších úložišť bez telemetrie nebo konvergence se berou jako
+        chybějící a spočítají se znovu, se zadanými checkpoints i běhy uložené
+        s jinou mřížkou checkpointů (jinak by je convergence() nešlo agregovat).
+        """
+        known = {key: cp for key, cp in self.connection.execute(
+            "SELECT key, checkpoints FROM runs WHERE wall_time IS NOT NULL AND convergence IS NOT NULL")}
+        if checkpoints is not None:
+            expected = np.asarray(checkpoints, dtype=np.int64).tobytes()
+            known = {key: cp for key, cp in known.items() if cp == expected}
+        return [key for key in keys if key not in known]
+
+    def put(self, key, function, algorithm, experiment, dimension, max_ofe, params, seed, best_f,
+            telemetry=None, checkpoints=None, convergence=None):
+        """
+        Uloží jeden běh (commit hned, aby přežil pád zbytku benchmarku).
+        telemetry: slovník se sloupci z TELEMETRY_COLUMNS (chybějící => NULL)
+        checkpoints, convergence: křivka konvergence (viz core.budget.BudgetedFunction.convergence)
+
+        NaN v best_f i v křivce (běh bez jediné platné hodnoty) se ukládá jako +inf:
+        best_f je NOT NULL a pro minimalizaci je +inf nejhorší možný výsledek.
+        """
+        telemetry = telemetry or {}
+        best_f = float(best_f)
+        if math.isnan(best_f):
+            best_f = math.inf
+        if convergence is not None:
+            convergence = np.nan_to_num(np.asarray(convergence, dtype=np.float64), nan=np.inf,
+                                        posinf=np.inf, neginf=-np.inf)
+        columns = ["key", "function", "algorithm", "experiment", "dimension", "max_ofe",
+                   "params", "seed", "best_f", "created"] + list(TELEMETRY_COLUMNS) + list(CURVE_COLUMNS)
+        values = [key, function, algorithm, experiment, dimension, max_ofe,
+                  json.dumps(params, sort_keys=True, default=str),
+                  json.dumps(seed, default=str), best_f, time.time()]
+        values += [telemetry.get(column) for column in TELEMETRY_COLUMNS]
+        values += [None if checkpoints is None else np.asarray(checkpoints, dtype=np.int64).tobytes(),
+                   None if convergence is None else np.asarray(convergence, dtype=np.float64).tobytes()]
+        with self.connection:
+            self.connection.execute(
+                f"INSERT OR REPLACE INTO runs ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                values,
+            )
+
+    def frame(self, keys=None):
+        """Uložené běhy jako DataFrame (jen zadané klíče, v jejich pořadí; None = vše)."""
+        df = pd.read_sql_query("SELECT * FROM runs", self.connection)
+        if keys is None:
+            return df
+        return df.set_index("key").loc[list(keys)].reset_index()
+
+    def convergence(self, keys):
+        """
+        Křivky konvergence zadaných běhů jako matice (len(keys), C).
+        Všechny běhy musí mít stejné checkpointy; vrací (checkpoints, curves).
+        """
+        placeholders = ", ".join("?" * len(keys))
+        rows = dict((key, (cp, curve)) for key, cp, curve in self.connection.execute(
+            f"SELECT key, checkpoints, convergence FROM runs WHERE key IN ({placeholders})", list(keys)))
+        checkpoints = np.frombuffer(rows[keys[0]][0], dtype=np.int64)
+        curves = np.empty((len(keys), len(checkpoints)))
+        for i, key in enumerate(keys):
+            cp, curve = rows[key]
+            if cp != rows[keys[0]][0]:
+                raise ValueError("Běhy mají různé checkpointy konvergence, nelze je agregovat")
+            curves[i] = np.frombuffer(curve, dtype=np.float64)
+        return checkpoints, curves
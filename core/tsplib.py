@@ -0,0 +1,241 @@
+import os
+import json
+import hashlib
+import numpy as np
+from core.distance_matrix import DistanceMatrix, LAZY_THRESHOLD
+
+# Rozparsované instance se ukládají binárně (.npy) a při dalším načtení se jen namapují do paměti
+TSPLIB_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                ".cache", "tsplib")
+_CACHE_VERSION = 1
+
+SUPPORTED_EDGE_WEIGHT_TYPES = ("EUC_2D", "CEIL_2D", "ATT", "GEO", "EXPLICIT")
+
+# Pořadí prvků v EDGE_WEIGHT_SECTION -> (horní trojúhelník?, včetně diagonály?)
+# *_COL formáty symetrické matice mají stejné pořadí jako transponovaný *_ROW
+_TRIANGULAR_FORMATS = {
+    "UPPER_ROW": (True, False), "LOWER_COL": (True, False),
+    "LOWER_ROW": (False, False), "UPPER_COL": (False, False),
+    "UPPER_DIAG_ROW": (True, True), "LOWER_DIAG_COL": (True, True),
+    "LOWER_DIAG_ROW": (False, True), "UPPER_DIAG_COL": (False, True),
+}
+
+
+class TSPInstance:
+    """
+    Instance TSP načtená z TSPLIB.
+
+    coords: souřadnice (n, 2) – u explicitních instancí jen DISPLAY_DATA (nebo None)
+    matrix: explicitní matice vzdáleností (n, n), jinak None
+    optimal_tour / optimal_length: známé optimum (z .opt.tour nebo zadané), jinak None
+
+    Algoritmy (genetic_tsp, ant_colony_optimization) přijímají instanci přímo
+    místo pole měst – vzdálenosti berou z distance_matrix().
+    """
+    def __init__(self, name, edge_weight_type, coords=None, matrix=None, comment="",
+                 optimal_tour=None, optimal_length=None):
+        self.name = name
+        self.edge_weight_type = edge_weight_type
+        self.coords = coords
+        self.matrix = matrix
+        self.comment = comment
+        self.optimal_tour = optimal_tour
+        self.optimal_length = optimal_length
+        self._distance_matrices = {}
+
+    @property
+    def dimension(self):
+        return len(self.matrix) if self.matrix is not None else len(self.coords)
+
+    def __len__(self):
+        return self.dimension
+
+    def distance_matrix(self, dtype=np.float64, lazy=None):
+        """
+        Sdílená DistanceMatrix v metrice instance (pro n > LAZY_THRESHOLD implicitně líná).
+        Explicitní instance matici už mají, lazy u nich nemá vliv.
+        """
+        if lazy is None:
+            lazy = self.dimension > LAZY_THRESHOLD
+        key = (np.dtype(dtype).str, lazy)
+        if key not in self._distance_matrices:
+            if self.matrix is not None:
+                dist = DistanceMatrix.from_matrix(self.matrix, self.coords, dtype)
+            else:
+                dist = DistanceMatrix(self.coords, dtype, lazy, metric=self.edge_weight_type)
+            self._distance_matrices[key] = dist
+        return self._distance_matrices[key]
+
+    def tour_length(self, route):
+        return self.distance_matrix().tour_length(route)
+
+    def gap(self, length):
+        """Odchylka od optima v procentech (None, pokud optimum neznáme)."""
+        if not self.optimal_length:
+            return None
+        return 100.0 * (length - self.optimal_length) / self.optimal_length
+
+
+def _read_sections(path):
+    """Rozdělí soubor TSPLIB na hlavičku {klíč: hodnota} a sekce {název: seznam tokenů}."""
+    with open(path) as fh:
+        lines = fh.read().splitlines()
+
+    header, sections = {}, {}
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+        i += 1
+        if not line:
+            continue
+        keyword = line.split(":")[0].strip().upper()
+        if keyword == "EOF":
+            break
+        if keyword.endswith("_SECTION"):
+            start = i
+            # data sekce končí na dalším klíčovém slově (řádek začínající písmenem)
+            while i < len(lines) and not lines[i].lstrip()[:1].isalpha():
+                i += 1
+            sections[keyword] = " ".join(lines[start:i]).split()
+        elif ":" in line:
+            header[keyword] = line.split(":", 1)[1].strip()
+    return header, sections
+
+
+def _node_array(tokens, n):
+    """Řádky "index x y" -> pole (n, 2) seřazené podle indexu uzlu."""
+    values = np.array(tokens, dtype=float).reshape(-1, 3)
+    if len(values) != n:
+        raise ValueError(f"Očekáváno {n} uzlů, nalezeno {len(values)}")
+    coords = np.empty((n, 2))
+    coords[values[:, 0].astype(int) - 1] = values[:, 1:]
+    return coords
+
+
+def _explicit_matrix(tokens, n, edge_weight_format):
+    weights = np.array(tokens, dtype=float)
+    if edge_weight_format == "FULL_MATRIX":
+        if len(weights) != n * n:
+            raise ValueError(f"EDGE_WEIGHT_SECTION má {len(weights)} hodnot, očekáváno {n * n}")
+        return weights.reshape(n, n)
+    if edge_weight_format not in _TRIANGULAR_FORMATS:
+        raise ValueError(f"Nepodporovaný EDGE_WEIGHT_FORMAT: {edge_weight_format!r}")
+
+    upper, diagonal = _TRIANGULAR_FORMATS[edge_weight_format]
+    offset = 0 if diagonal else 1
+    rows, cols = np.triu_indices(n, offset) if upper else np.tril_indices(n, -offset)
+    if len(weights) != len(rows):
+        raise ValueError(f"EDGE_WEIGHT_SECTION má {len(weights)} hodnot, očekáváno {len(rows)}")
+    matrix = np.zeros((n, n))
+    matrix[rows, cols] = weights
+    matrix[cols, rows] = weights
+    return matrix
+
+
+def parse_tsp(path):
+    """
+    Rozparsuje .tsp soubor (typy EUC_2D, CEIL_2D, ATT, GEO a EXPLICIT).
+    Vrací (meta, data, display): data jsou souřadnice (n, 2) nebo matice (n, n),
+    display jsou DISPLAY_DATA explicitní instance (nebo None).
+    """
+    header, sections = _read_sections(path)
+    n = int(header["DIMENSION"])
+    edge_weight_type = header.get("EDGE_WEIGHT_TYPE", "EXPLICIT").upper()
+    if edge_weight_type not in SUPPORTED_EDGE_WEIGHT_TYPES:
+        raise ValueError(f"Nepodporovaný EDGE_WEIGHT_TYPE: {edge_weight_type!r} "
+                         f"(povoleno {', '.join(SUPPORTED_EDGE_WEIGHT_TYPES)})")
+
+    display = None
+    if edge_weight_type == "EXPLICIT":
+        edge_weight_format = header.get("EDGE_WEIGHT_FORMAT", "FULL_MATRIX").upper()
+        data = _explicit_matrix(sections["EDGE_WEIGHT_SECTION"], n, edge_weight_format)
+        if "DISPLAY_DATA_SECTION" in sections:
+            display = _node_array(sections["DISPLAY_DATA_SECTION"], n)
+    else:
+        data = _node_array(sections["NODE_COORD_SECTION"], n)
+
+    meta = {
+        "name": header.get("NAME", os.path.splitext(os.path.basename(path))[0]),
+        "comment": header.get("COMMENT", ""),
+        "edge_weight_type": edge_weight_type,
+    }
+    return meta, data, display
+
+
+def load_tour(path):
+    """Načte permutaci z .tour / .opt.tour souboru (indexy měst od 0)."""
+    _, sections = _read_sections(path)
+    tour = []
+    for token in sections["TOUR_SECTION"]:
+        city = int(token)
+        if city == -1:
+            break
+        tour.append(city - 1)
+    return np.array(tour, dtype=np.intp)
+
+
+def _save_npy(path, array):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as fh:
+        np.save(fh, array)
+    os.replace(tmp_path, path)
+
+
+def _cache_prefix(path, cache_dir):
+    """Klíčem cache je cesta, velikost a čas změny souboru (soubor se kvůli klíči nečte celý)."""
+    stat = os.stat(path)
+    key = repr((os.path.abspath(path), stat.st_size, stat.st_mtime_ns, _CACHE_VERSION))
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    stem = os.path.basename(path).split(".")[0]
+    return os.path.join(cache_dir, f"{stem}_{digest}")
+
+
+def load_tsplib(path, tour_path=None, optimum=None, cache_dir=TSPLIB_CACHE_DIR, mmap=True):
+    """
+    Načte instanci TSPLIB.
+
+    Při prvním načtení se text rozparsuje a data se uloží jako .npy do cache_dir,
+    další načtení jen namapují binární soubor do paměti (np.load(mmap_mode='r')),
+    takže i obří instance jsou k dispozici okamžitě (cache_dir=None = bez cache).
+
+    Args:
+        path: cesta k .tsp souboru
+        tour_path: .opt.tour s optimální cestou (None = hledá se <instance>.opt.tour vedle .tsp)
+        optimum: známá délka optimální cesty (přednost před délkou z tour_path)
+        mmap: mapovat data z cache do paměti místo načtení celé kopie
+    """
+    prefix = _cache_prefix(path, cache_dir) if cache_dir else None
+    if prefix and os.path.exists(prefix + ".json"):
+        with open(prefix + ".json") as fh:
+            meta = json.load(fh)
+        mmap_mode = "r" if mmap else None
+        data = np.load(prefix + ".npy", mmap_mode=mmap_mode)
+        display = np.load(prefix + "_display.npy", mmap_mode=mmap_mode) if meta["display"] else None
+    else:
+        meta, data, display = parse_tsp(path)
+        meta["display"] = display is not None
+        if prefix:
+            os.makedirs(cache_dir, exist_ok=True)
+            _save_npy(prefix + ".npy", data)
+            if display is not None:
+                _save_npy(prefix + "_display.npy", display)
+            # metadata se zapisují poslední – jejich existence znamená kompletní cache
+            tmp_path = f"{prefix}.json.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as fh:
+                json.dump(meta, fh)
+            os.replace(tmp_path, prefix + ".json")
+
+    if meta["edge_weight_type"] == "EXPLICIT":
+        instance = TSPInstance(meta["name"], "EXPLICIT", coords=display, matrix=data, comment=meta["comment"])
+    else:
+        instance = TSPInstance(meta["name"], meta["edge_weight_type"], coords=data, comment=meta["comment"])
+
+    if tour_path is None:
+        candidate = os.path.splitext(path)[0] + ".opt.tour"
+        tour_path = candidate if os.path.exists(candidate) else None
+    if tour_path is not None:
+        instance.optimal_tour = load_tour(tour_path)
+        instance.optimal_length = instance.tour_length(instance.optimal_tour)
+    if optimum is not None:
+        instance.optimal_length = float(optimum)
+    return instance
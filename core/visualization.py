@@ -1,6 +1,11 @@
+import os
+import inspect
+import hashlib
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib import animation
+from core.history import history_arrays
+from core.base_function import FunctionWrapper
 
 # numpy.linspace(start, stop, num=50, endpoint=True, retstep=False, dtype=None, axis=0, *, device=None)[source]
     # Return evenly spaced numbers over a specified interval.
@@ -12,8 +17,62 @@ from matplotlib import animation
 
 
 
-def get_visualization_grid(func, grid_points):
-    """Vrátí X, Y, Z mřížku pro vizualizaci funkce."""
+# Spočítané mřížky se ukládají na disk, aby se stejná krajina nepočítala pro každý GIF znovu
+GRID_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                              ".cache", "grids")
+# Zvýšit při změně formátu nebo výpočtu mřížky – staré soubory se pak nepoužijí
+GRID_CACHE_VERSION = 2
+
+
+def _unwrap(func):
+    """Testovací funkce pod obálkami (rozpočet, cache) – mřížka krajiny do běhu nepatří."""
+    while isinstance(func, FunctionWrapper):
+        func = func.function
+    return func
+
+
+def _code_digest(cls):
+    """Hash zdrojového kódu třídy, aby úprava funkce zneplatnila uložené mřížky."""
+    try:
+        source = inspect.getsource(cls)
+    except (OSError, TypeError):
+        source = repr(cls.evaluate_batch.__code__.co_code)
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+
+def _grid_cache_path(func, grid_points, cache_dir):
+    """
+    Cesta k .npz souboru s mřížkou – klíčem je třída funkce (včetně hashe jejího kódu),
+    její parametry (dimenze, meze, konstanty), rozlišení a GRID_CACHE_VERSION.
+    """
+    params = sorted((k, repr(v)) for k, v in vars(func).items()
+                    if isinstance(v, (int, float, str, tuple, np.number)))
+    cls = type(func)
+    key = repr((cls.__module__, cls.__qualname__, _code_digest(cls), GRID_CACHE_VERSION, params, grid_points))
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{func.name}_{grid_points}_{digest}.npz")
+
+
+def _lod_grid(X, Y, Z, lod):
+    """Každý lod-tý bod mřížky (krajní body zůstávají)."""
+    if lod <= 1:
+        return X, Y, Z
+    grid_points = X.shape[0]
+    idx = np.unique(np.r_[0:grid_points:lod, grid_points - 1])
+    return X[np.ix_(idx, idx)], Y[np.ix_(idx, idx)], Z[np.ix_(idx, idx)]
+
+
+def get_visualization_grid(func, grid_points, lod=1, cache_dir=GRID_CACHE_DIR):
+    """
+    Vrátí X, Y, Z mřížku pro vizualizaci funkce.
+
+    Z se počítá jedním dávkovým voláním evaluate_batch() a ukládá se do
+    cache_dir (None = bez diskové cache).
+    lod (level of detail): vezme se jen každý lod-tý bod mřížky (krajní body
+    zůstávají), např. pro řidší 3D plot_surface nad stejnou mřížkou jako kontura.
+    Obálky (BudgetedFunction, CachedFunction) se sundají – mřížka nespotřebuje rozpočet.
+    """
+    func = _unwrap(func)
     if hasattr(func, "viz_bounds"):
         x = np.linspace(func.viz_bounds[0], func.viz_bounds[1], grid_points)
         y = np.linspace(func.viz_bounds[2], func.viz_bounds[3], grid_points)
@@ -22,19 +81,30 @@ def get_visualization_grid(func, grid_points):
         y = np.linspace(func.lower_bound, func.upper_bound, grid_points)
 
     X, Y = np.meshgrid(x, y)
-    Z = np.array([func.evaluate(np.array([xx, yy]))
-                  for xx, yy in zip(np.ravel(X), np.ravel(Y))])
-    Z = Z.reshape(X.shape)
-    return X, Y, Z
+
+    path = _grid_cache_path(func, grid_points, cache_dir) if cache_dir else None
+    if path and os.path.exists(path):
+        with np.load(path) as data:
+            Z = data["Z"]
+    else:
+        Z = func.evaluate_batch(np.column_stack([X.ravel(), Y.ravel()]))
+        Z = Z.reshape(X.shape)
+        if path:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+            np.savez(tmp_path, Z=Z)
+            os.replace(tmp_path, path)
+
+    return _lod_grid(X, Y, Z, lod)
 
 
-def visualize_function(func):
+def visualize_function(func, surface_lod=1):
     if func.dimension != 2:
         print("3D vizualizace funguje jen pro 2D funkce!")
         return
 
     grid_points = func.ideal_grid_points()
-    X, Y, Z = get_visualization_grid(func, grid_points)
+    X, Y, Z = get_visualization_grid(func, grid_points, lod=surface_lod)
 
     fig = plt.figure(figsize=(8, 6))
     ax = fig.add_subplot(111, projection="3d")
@@ -57,13 +127,25 @@ def visualize_function(func):
     #plt.show()
 
 
-def visualize_search_gif(func, history, filename="search.gif"):
+def visualize_search_gif(func, history, filename="search.gif", surface_lod=2):
+    """
+    Animace trajektorie (HC, SA, blind search).
+    history: HistoryRecorder bodů (pole (G, 2) a (G,) se čtou přímo) nebo starý seznam [(x, f), ...]
+    """
     if func.dimension != 2:
         print("3D vizualizace funguje jen pro 2D funkce!")
         return
 
+    positions, fitness = history_arrays(history)
+    n_frames = len(fitness)
+    # best-so-far a jeho pozice pro všechny snímky najednou
+    best_values = np.minimum.accumulate(fitness)
+    best_index = np.maximum.accumulate(np.where(fitness == best_values, np.arange(n_frames), 0))
+
     grid_points = func.ideal_grid_points()
     X, Y, Z = get_visualization_grid(func, grid_points)
+    # 3D povrch stačí řidší (rychlejší vykreslení každého snímku) – výřez z téže mřížky
+    Xs, Ys, Zs = _lod_grid(X, Y, Z, surface_lod)
 
     fig, axs = plt.subplots(2, 2, figsize=(12, 10))
     ax3d = fig.add_subplot(221, projection="3d")
@@ -72,7 +154,7 @@ def visualize_search_gif(func, history, filename="search.gif"):
     axplot = axs[1, 1]
 
     # --- 3D surface ---
-    surf = ax3d.plot_surface(X, Y, Z, cmap="jet", edgecolor="k", linewidth=0.3)
+    surf = ax3d.plot_surface(Xs, Ys, Zs, cmap="jet", edgecolor="k", linewidth=0.3)
 
     if hasattr(func, "viz_bounds"):
         ax3d.set_xlim(func.viz_bounds[0], func.viz_bounds[1])
@@ -118,49 +200,37 @@ def visualize_search_gif(func, history, filename="search.gif"):
     table.scale(1, 2)
 
     # --- graf konvergence ---
-    axplot.set_xlim(0, len(history))
-    all_f = [h[1] for h in history]
+    axplot.set_xlim(0, n_frames)
     epsilon = 1e-6  # Oprava chybky s nulovým rozsahem
-    axplot.set_ylim(0, max(all_f) + epsilon)
+    axplot.set_ylim(0, np.max(fitness) + epsilon)
     axplot.set_title("Nejlepší hodnota v čase")
     axplot.set_xlabel("Krok")
     axplot.set_ylabel("f(x)")
     line_best, = axplot.plot([], [], "b-", label="Best so far")
     axplot.legend()
 
-    best_so_far = float("inf")
-    best_pos = None
-    best_values = []
-
     # === update funkce ===
     def update(i):
-        nonlocal best_so_far, best_pos
-
-        x_val = history[i][0][0]
-        y_val = history[i][0][1]
-        z_val = history[i][1]
+        x_val, y_val = positions[i]
+        z_val = fitness[i]
 
         # 3D bod
         point3d.set_data([x_val], [y_val])
         point3d.set_3d_properties([z_val])
 
         # 2D bod + trajektorie
-        xs = [h[0][0] for h in history[:i+1]]
-        ys = [h[0][1] for h in history[:i+1]]
-        trajectory.set_data(xs, ys)
+        trajectory.set_data(positions[:i + 1, 0], positions[:i + 1, 1])
         point2d.set_data([x_val], [y_val])
 
         # nejlepší hodnota zatím
-        if z_val < best_so_far:
-            best_so_far = z_val
-            best_pos = (x_val, y_val)
-        best_values.append(best_so_far)
+        best_so_far = best_values[i]
+        best_pos = positions[best_index[i]]
 
         # update grafu konvergence
-        line_best.set_data(range(1, len(best_values)+1), best_values)
+        line_best.set_data(np.arange(1, i + 2), best_values[:i + 1])
 
         # update tabulky
-        table._cells[(0, 1)].get_text().set_text(f"{i+1}/{len(history)}")
+        table._cells[(0, 1)].get_text().set_text(f"{i+1}/{n_frames}")
         table._cells[(1, 1)].get_text().set_text(f"({x_val:.2f}, {y_val:.2f})")
         table._cells[(2, 1)].get_text().set_text(f"{z_val:.4f}")
         table._cells[(3, 1)].get_text().set_text(
@@ -170,7 +240,7 @@ def visualize_search_gif(func, history, filename="search.gif"):
         return point3d, trajectory, point2d, line_best, table
 
     ani = animation.FuncAnimation(
-        fig, update, frames=len(history), interval=200, blit=False, repeat=False
+        fig, update, frames=n_frames, interval=200, blit=False, repeat=False
     )
 
     ani.save(filename, writer="pillow", fps=3)
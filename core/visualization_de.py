@@ -2,6 +2,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib import animation, gridspec
 from core.visualization import get_visualization_grid
+from core.history import history_arrays
 
 
 def visualize_population_evolution(func, history, filename="de_population.gif", algorithm_name="Differential Evolution"):
@@ -10,11 +11,18 @@ def visualize_population_evolution(func, history, filename="de_population.gif",
     - vlevo: konturový graf s populací
     - vpravo: graf konvergence (nejlepší hodnota v čase)
     - dole: tabulka nejlepších jedinců
+
+    history: HistoryRecorder populací (pole (G, NP, 2) a (G, NP) se čtou přímo)
+             nebo starý seznam generací [[(x, f), ...], ...]
     """
     if func.dimension != 2:
         print("Vizualizace funguje jen pro 2D funkce.")
         return
 
+    all_positions, all_fitness = history_arrays(history)
+    n_frames = len(all_fitness)
+    best_values = np.minimum.accumulate(np.min(all_fitness, axis=1))
+
     grid_points = func.ideal_grid_points()
     X, Y, Z = get_visualization_grid(func, grid_points)
 
@@ -59,21 +67,15 @@ def visualize_population_evolution(func, history, filename="de_population.gif",
     ax_convergence.set_title("Nejlepší hodnota v čase", fontsize=13, fontweight="bold")
     ax_convergence.set_xlabel("Generace")
     ax_convergence.set_ylabel("f(x)")
-    ax_convergence.set_xlim(1, len(history))  # <-- začínáme od 1
-    ax_convergence.set_ylim(0, max(f for gen in history for _, f in gen))
+    ax_convergence.set_xlim(1, n_frames)  # <-- začínáme od 1
+    ax_convergence.set_ylim(0, np.max(all_fitness))
     line_best, = ax_convergence.plot([], [], "b-", label="Best so far", linewidth=2)
     ax_convergence.legend()
 
-    best_so_far = float("inf")
-    best_values = []
-
     # === update funkce ===
     def update(frame):
-        nonlocal best_so_far
-
-        gen = history[frame]
-        positions = np.array([p for p, _ in gen])
-        values = np.array([f for _, f in gen])
+        positions = all_positions[frame]
+        values = all_fitness[frame]
 
         # --- aktualizace populace ---
         scat.set_offsets(positions)
@@ -121,15 +123,13 @@ def visualize_population_evolution(func, history, filename="de_population.gif",
             cell.set_linewidth(0.4)
 
         # --- konvergence ---
-        if np.min(values) < best_so_far:
-            best_so_far = np.min(values)
-        best_values.append(best_so_far)
+        best_so_far = best_values[frame]
         # X osa začíná na 1 místo 0
-        line_best.set_data(range(1, len(best_values) + 1), best_values)
+        line_best.set_data(np.arange(1, frame + 2), best_values[:frame + 1])
 
         # --- aktualizace titulu ---
         ax_contour.set_title(
-            f"{func.name} – Generace {frame+1}/{len(history)} | Nejlepší f = {best_so_far:.5f}",
+            f"{func.name} – Generace {frame+1}/{n_frames} | Nejlepší f = {best_so_far:.5f}",
             fontsize=12,
             fontweight="bold"
         )
@@ -137,7 +137,7 @@ def visualize_population_evolution(func, history, filename="de_population.gif",
         return scat, best_point, line_best, table
 
     ani = animation.FuncAnimation(
-        fig, update, frames=len(history), interval=250, blit=False, repeat=False
+        fig, update, frames=n_frames, interval=250, blit=False, repeat=False
     )
 
     ani.save(filename, writer="pillow", fps=4)
@@ -10,11 +10,21 @@ def visualize_tsp(history, cities, filename="tsp.gif"):
     - Druhý graf ukazuje vývoj nejlepší vzdálenosti v čase
 
     Args:
-        history: seznam [(route, distance)] z běhu GA
-        cities: np.ndarray tvaru (n, 2) – souřadnice měst
+        history: seznam [(route, distance)] z běhu GA/ACO (route jako seznam i np.ndarray)
+        cities: np.ndarray tvaru (n, 2) – souřadnice měst, nebo TSPInstance (vykreslí se její coords)
         filename: kam uložit výsledný .gif
     """
-    cities = np.array(cities)
+    coords = getattr(cities, "coords", cities)
+    if coords is None:
+        # explicitní instance TSPLIB bez DISPLAY_DATA_SECTION
+        raise ValueError(f"Instance {getattr(cities, 'name', cities)!r} nemá souřadnice k vykreslení")
+    cities = np.array(coords, dtype=float)
+
+    # Všechny cesty jako matice (G, n), délky jsou uložené v historii (v metrice běhu)
+    routes = np.array([np.asarray(route) for route, _ in history])
+    best_values = np.array([distance for _, distance in history], dtype=float)
+    closed_routes = np.concatenate([routes, routes[:, :1]], axis=1)
+
     fig, (ax_path, ax_plot) = plt.subplots(1, 2, figsize=(12, 6))
 
     # --- Nastavení grafu cesty ---
@@ -33,23 +43,19 @@ def visualize_tsp(history, cities, filename="tsp.gif"):
     ax_plot.set_xlabel("Generation")
     ax_plot.set_ylabel("Distance")
     line_best, = ax_plot.plot([], [], "g-", lw=2, label="Best distance")
+    ax_plot.set_xlim(0, len(history))
+    ax_plot.set_ylim(0, np.max(best_values) * 1.1)
     ax_plot.legend()
 
-    best_values = []
-
     # === update funkce ===
     def update(i):
-        route, dist = history[i]
-        route_coords = cities[route + [route[0]]]
+        route_coords = cities[closed_routes[i]]
 
         # aktualizace cesty
         line.set_data(route_coords[:, 0], route_coords[:, 1])
 
         # aktualizace konvergence
-        best_values.append(dist)
-        line_best.set_data(range(len(best_values)), best_values)
-        ax_plot.set_xlim(0, len(history))
-        ax_plot.set_ylim(0, max(best_values) * 1.1)
+        line_best.set_data(np.arange(i + 1), best_values[:i + 1])
 
         return line, line_best
 
@@ -16,14 +16,18 @@ class Ackley(Function):
         self.c = c
 
     def evaluate(self, x: np.ndarray) -> float:
-        d = self.dimension
-        sum1 = np.sum(x ** 2)
-        sum2 = np.sum(np.cos(self.c * x))
+        return self.evaluate_batch(np.asarray(x))
+
+    def evaluate_batch(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X)
+        d = X.shape[-1]
+        sum1 = np.sum(X ** 2, axis=-1)
+        sum2 = np.sum(np.cos(self.c * X), axis=-1)
 
         term1 = -self.a * np.exp(-self.b * np.sqrt(sum1 / d))
         term2 = -np.exp(sum2 / d)
 
-        return term1 + term2 + self.a + np.exp(1)
+        return term1 + term2 + self.a + np.e
 
     def ideal_grid_points(self, base_density=50):
         return 30
@@ -16,9 +16,13 @@ class Griewank(Function):
         self.viz_bounds = (-10, 10, -10, 10)
 
     def evaluate(self, x: np.ndarray) -> float:
-        d = self.dimension
-        sum_val = np.sum(x**2) / 4000
-        prod_val = np.prod([np.cos(x[i] / np.sqrt(i + 1)) for i in range(d)])
+        return self.evaluate_batch(np.asarray(x))
+
+    def evaluate_batch(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X)
+        d = X.shape[-1]
+        sum_val = np.sum(X**2, axis=-1) / 4000
+        prod_val = np.prod(np.cos(X / np.sqrt(np.arange(1, d + 1, dtype=X.dtype))), axis=-1)
         return sum_val - prod_val + 1
 
     def ideal_grid_points(self, base_density=50):
@@ -16,16 +16,16 @@ class Levy(Function):
         self.viz_bounds = (-10, 10, -10, 10)
 
     def evaluate(self, x: np.ndarray) -> float:
-        d = self.dimension
+        return self.evaluate_batch(np.asarray(x))
 
-        w = 1 + (x - 1) / 4
-        term1 = np.sin(np.pi * w[0])**2
-        term3 = (w[-1] - 1)**2 * (1 + np.sin(2 * np.pi * w[-1])**2)
+    def evaluate_batch(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X)
+        W = 1 + (X - 1) / 4
+        term1 = np.sin(np.pi * W[..., 0])**2
+        term3 = (W[..., -1] - 1)**2 * (1 + np.sin(2 * np.pi * W[..., -1])**2)
 
-        sum_val = 0
-        for i in range(d - 1):
-            wi = w[i]
-            sum_val += (wi - 1)**2 * (1 + 10 * np.sin(np.pi * wi + 1)**2)
+        wi = W[..., :-1]
+        sum_val = np.sum((wi - 1)**2 * (1 + 10 * np.sin(np.pi * wi + 1)**2), axis=-1)
 
         return term1 + sum_val + term3
 
@@ -19,12 +19,14 @@ class Michalewicz(Function):
         self.viz_bounds = (0, np.pi, 0, np.pi)
 
     def evaluate(self, x: np.ndarray) -> float:
-        d = self.dimension
+        return self.evaluate_batch(np.asarray(x))
+
+    def evaluate_batch(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X)
+        d = X.shape[-1]
         m = self.m
-        sum_val = 0
-        for i in range(d):
-            xi = x[i]
-            sum_val += np.sin(xi) * (np.sin((i + 1) * xi**2 / np.pi) ** (2 * m))
+        i = np.arange(1, d + 1, dtype=X.dtype)
+        sum_val = np.sum(np.sin(X) * (np.sin(i * X**2 / np.pi) ** (2 * m)), axis=-1)
         return -sum_val
 
     def ideal_grid_points(self, base_density=50):
@@ -16,8 +16,12 @@ class Rastrigin(Function):
         self.viz_bounds = (-5.12, 5.12, -5.12, 5.12)
 
     def evaluate(self, x: np.ndarray) -> float:
-        d = self.dimension
-        return 10 * d + np.sum(x**2 - 10 * np.cos(2 * np.pi * x))
+        return self.evaluate_batch(np.asarray(x))
+
+    def evaluate_batch(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X)
+        d = X.shape[-1]
+        return 10 * d + np.sum(X**2 - 10 * np.cos(2 * np.pi * X), axis=-1)
 
     def ideal_grid_points(self, base_density=50):
         return 200
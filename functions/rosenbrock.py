@@ -16,13 +16,13 @@ class Rosenbrock(Function):
         self.viz_bounds = (-10, 10, -6, 6)
 
     def evaluate(self, x: np.ndarray) -> float:
-        d = self.dimension
-        sum_val = 0
-        for i in range(d - 1):
-            xi = x[i]
-            xnext = x[i + 1]
-            sum_val += 100 * (xnext - xi**2) ** 2 + (xi - 1) ** 2
-        return sum_val
+        return self.evaluate_batch(np.asarray(x))
+
+    def evaluate_batch(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X)
+        xi = X[..., :-1]
+        xnext = X[..., 1:]
+        return np.sum(100 * (xnext - xi**2) ** 2 + (xi - 1) ** 2, axis=-1)
 
     def ideal_grid_points(self, base_density=50):
         return 200
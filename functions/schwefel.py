@@ -16,8 +16,12 @@ class Schwefel(Function):
         self.viz_bounds = (-500, 500, -500, 500)
 
     def evaluate(self, x: np.ndarray) -> float:
-        d = self.dimension
-        sum_val = np.sum(x * np.sin(np.sqrt(np.abs(x))))
+        return self.evaluate_batch(np.asarray(x))
+
+    def evaluate_batch(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X)
+        d = X.shape[-1]
+        sum_val = np.sum(X * np.sin(np.sqrt(np.abs(X))), axis=-1)
         return 418.9829 * d - sum_val
 
     def ideal_grid_points(self, base_density=50):
@@ -7,7 +7,11 @@ class Sphere(Function):
         super().__init__("Sphere", dimension, lower_bound, upper_bound)
 
     def evaluate(self, x: np.ndarray) -> float:
-        return np.sum(x**2)
+        return self.evaluate_batch(np.asarray(x))
+
+    def evaluate_batch(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X)
+        return np.sum(X**2, axis=-1)
 
     def ideal_grid_points(self, base_density=50):
         return 80
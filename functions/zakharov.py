@@ -16,9 +16,13 @@ class Zakharov(Function):
         self.viz_bounds = (-10, 10, -10, 10)
 
     def evaluate(self, x: np.ndarray) -> float:
-        d = self.dimension
-        sum1 = np.sum(x**2)
-        sum2 = np.sum(0.5 * (np.arange(1, d + 1)) * x)
+        return self.evaluate_batch(np.asarray(x))
+
+    def evaluate_batch(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X)
+        d = X.shape[-1]
+        sum1 = np.sum(X**2, axis=-1)
+        sum2 = np.sum(0.5 * (np.arange(1, d + 1, dtype=X.dtype)) * X, axis=-1)
         return sum1 + sum2**2 + sum2**4
 
     def ideal_grid_points(self, base_density=50):
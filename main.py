@@ -2,14 +2,18 @@ import numpy as np
 import pandas as pd
 import os
 import sys
+import time
+import hashlib
+import traceback
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-# --- Import algoritmů ---
-# Předpokládá se, že tyto soubory existují ve složce algorithms/
-from algorithms.differential_evolution import differential_evolution
-from algorithms.particle_swarm_optimization import particle_swarm_optimization
-from algorithms.soma import soma_all_to_one
-from algorithms.firefly_algorithm import firefly_algorithm
-from algorithms.tlbo import tlbo
+# --- Algoritmy ---
+# Algoritmy ze složky algorithms/ se hlásí do registru dekorátorem @register
+from core.registry import get_algorithm, run_algorithm
+from core.budget import convergence_checkpoints
+from core.result_store import ResultStore, TELEMETRY_COLUMNS, run_key
+from core.precision import get_default_dtype, set_default_dtype
 
 # --- Import testovacích funkcí ---
 # Předpokládá se, že tyto soubory existují ve složce functions/
@@ -24,7 +28,161 @@ from functions.michalewicz import Michalewicz
 from functions.zakharov import Zakharov
 
 
-def run_benchmark():
+def run_experiment(task):
+    """
+    Jeden běh (funkce, algoritmus, experiment) – top-level funkce, aby šla poslat do procesu.
+    Globální np.random se před během nastaví z vlastní SeedSequence experimentu,
+    výsledek tedy nezávisí na tom, který proces a v jakém pořadí ho spočítá.
+
+    Vrací (best_f, telemetrie, křivka konvergence v checkpoints) – sloupce telemetrie
+    viz core.result_store.TELEMETRY_COLUMNS.
+    S track_memory se běh po změření času zopakuje se stejným seedem pod
+    tracemalloc (který běh zpomaluje) jen kvůli špičkové paměti – časy tím nejsou
+    ovlivněné, celkový čas benchmarku se ale zhruba zdvojnásobí.
+    """
+    (FuncClass, dimension, algo_name, kwargs, max_ofe, cache_size, count_cache_hits, track_memory,
+     checkpoints, dtype, seed_seq) = task
+    # globální dtype (core.precision) z rodiče se do procesů poolu nedědí, posílá se v úloze
+    set_default_dtype(dtype)
+    run_kwargs = dict(kwargs, cache_size=cache_size, count_cache_hits=count_cache_hits,
+                      checkpoints=checkpoints)
+
+    np.random.seed(seed_seq.generate_state(4))
+    f = FuncClass(dimension=dimension)
+    start = time.perf_counter()
+    # history se v benchmarku vůbec neukládá (registr nastavuje record_history=False)
+    _, best_val, _, budget = run_algorithm(algo_name, f, max_ofe, **run_kwargs)
+    wall_time = time.perf_counter() - start
+
+    peak_memory_mb = None
+    if track_memory:
+        # stejný běh znovu, mimo měřený čas
+        np.random.seed(seed_seq.generate_state(4))
+        f = FuncClass(dimension=dimension)
+        tracemalloc.start()
+        try:
+            run_algorithm(algo_name, f, max_ofe, **run_kwargs)
+            peak_memory_mb = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+
+    telemetry = {
+        "wall_time": wall_time,
+        "evaluations": int(budget.evaluations),
+        "evals_per_sec": budget.evaluations / wall_time,
+        "objective_time": budget.eval_time,
+        "objective_fraction": budget.eval_time / wall_time,
+        "peak_memory_mb": peak_memory_mb,
+    }
+    return float(best_val), telemetry, budget.convergence()
+
+
+def experiment_seed(root_seed, function_name, algo_name, experiment):
+    """
+    SeedSequence jednoho běhu z kořenového seedu a názvů (funkce, algoritmus, experiment).
+    Nezávisí na pozici v mřížce – přidání, odebrání nebo přeházení algoritmů
+    či funkcí nezmění seedy (a tedy ani klíče v úložišti) ostatních běhů.
+    """
+    name = f"{function_name}/{algo_name}/{experiment}"
+    digest = hashlib.sha256(name.encode("utf-8")).digest()
+    return np.random.SeedSequence([root_seed, int.from_bytes(digest[:16], "little")])
+
+
+def _report_failure(task, exc):
+    FuncClass, algo_name = task[0], task[2]
+    print(f"  CHYBA běhu {FuncClass.__name__}/{algo_name}: {exc!r}", file=sys.stderr)
+    traceback.print_exception(exc, file=sys.stderr)
+
+
+def run_experiments(tasks, workers=None):
+    """
+    Spustí úlohy v poolu procesů (workers=None => počet jader, 1 => sekvenčně v tomto procesu).
+    Generuje dvojice (index úlohy, výsledek) v pořadí dokončení, aby šlo každý
+    výsledek hned uložit; pořadí ve výstupu určují indexy, ne pořadí dokončení.
+    Běh, který skončí výjimkou, se vypíše a přeskočí – ostatní běhy pokračují
+    a jejich výsledky se uloží, chybějící běh se spočítá při dalším spuštění.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for index, task in enumerate(tasks):
+            try:
+                result = run_experiment(task)
+            except Exception as exc:
+                _report_failure(task, exc)
+                continue
+            yield index, result
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_experiment, task): index for index, task in enumerate(tasks)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                result = future.result()
+            except Exception as exc:
+                _report_failure(tasks[index], exc)
+                continue
+            yield index, result
+
+
+def export_excel(store, runs, output_file, functions, algorithms, num_experiments):
+    """Excel z úložiště: list pro každou funkci, řádky Experiment 1..N + Mean + Std. Dev."""
+    df = store.frame([run["key"] for run in runs])
+
+    # Příprava indexů tabulky (Experiment 1..30, Mean, Std)
+    rows = [f"Experiment {i + 1}" for i in range(num_experiments)]
+    rows.append("Mean")
+    rows.append("Std. Dev.")
+
+    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+        for function_name in functions:
+            results_table = pd.DataFrame(index=rows, columns=algorithms)
+            for algo_name in algorithms:
+                selected = df[(df["function"] == function_name) & (df["algorithm"] == algo_name)]
+                best_values = selected.sort_values("experiment")["best_f"].to_numpy()
+
+                # 1. Hodnoty jednotlivých experimentů
+                results_table.loc[rows[:num_experiments], algo_name] = best_values
+
+                # 2. Statistiky (Průměr a Směrodatná odchylka) [cite: 144]
+                results_table.loc["Mean", algo_name] = np.mean(best_values)
+                results_table.loc["Std. Dev.", algo_name] = np.std(best_values)
+
+            # Uložení listu do Excelu (název listu = název funkce)
+            results_table.to_excel(writer, sheet_name=function_name)
+
+        # Telemetrie: průměr přes experimenty pro každou dvojici funkce/algoritmus
+        telemetry = df.groupby(["function", "algorithm"], sort=False)[list(TELEMETRY_COLUMNS)].mean()
+        telemetry = telemetry.reindex(pd.MultiIndex.from_product([functions, algorithms],
+                                                                 names=["function", "algorithm"]))
+        telemetry.to_excel(writer, sheet_name="Telemetry")
+
+        # Konvergence: best-so-far v checkpointech (řádky = OFE), statistiky přes experimenty
+        curves = {}
+        for function_name in functions:
+            for algo_name in algorithms:
+                keys = [run["key"] for run in runs
+                        if run["function"] == function_name and run["algorithm"] == algo_name]
+                checkpoints, matrix = store.convergence(keys)
+                curves[(function_name, algo_name, "Mean")] = matrix.mean(axis=0)
+                curves[(function_name, algo_name, "Median")] = np.median(matrix, axis=0)
+                curves[(function_name, algo_name, "Q25")] = np.quantile(matrix, 0.25, axis=0)
+                curves[(function_name, algo_name, "Q75")] = np.quantile(matrix, 0.75, axis=0)
+        convergence = pd.DataFrame(curves, index=pd.Index(checkpoints, name="OFE"))
+        convergence.to_excel(writer, sheet_name="Convergence")
+
+
+def run_benchmark(workers=None, root_seed=2024, store_path="results_exercise10.sqlite"):
+    """
+    workers: počet procesů (None = všechna jádra, 1 = sekvenčně)
+    root_seed: kořenový seed; každý experiment dostane vlastní SeedSequence
+               odvozenou z názvů funkce, algoritmu a čísla experimentu
+               (viz experiment_seed), výsledky jsou proto stejné pro libovolný
+               počet procesů i po změně mřížky.
+    store_path: SQLite úložiště výsledků (core.result_store); běhy, které v něm
+                už jsou (stejný algoritmus, parametry včetně počtu checkpointů,
+                funkce, rozpočet a seed), se znovu nepočítají.
+    """
     # ==========================================
     # NASTAVENÍ EXPERIMENTU (podle Exercise 10)
     # ==========================================
@@ -33,6 +191,10 @@ def run_benchmark():
     POP_SIZE = 30
     MAX_OFE = 3000
     NUM_EXPERIMENTS = 30
+    EVAL_CACHE_SIZE = None      # např. 10000 => LRU cache opakovaných bodů (None = vypnuto)
+    COUNT_CACHE_HITS = True     # zda zásahy cache čerpají rozpočet MAX_OFE
+    TRACK_MEMORY = False        # špičková paměť přes tracemalloc v dalším (neměřeném) běhu – 2× delší benchmark
+    CHECKPOINTS = 100           # best-so-far v 1 %, 2 %, ..., 100 % rozpočtu (křivky konvergence)
     OUTPUT_FILE = "results_exercise10.xlsx"
 
     # Seznam funkcí k testování
@@ -41,31 +203,17 @@ def run_benchmark():
         Rastrigin, Griewank, Levy, Michalewicz, Zakharov
     ]
 
-    # --- VÝPOČET GENERACÍ PRO DODRŽENÍ LIMITU Max_OFE ---
-    # Cílem je dát každému algoritmu maximum prostoru v rámci limitu 3000 evaluací.
-
-    # 1. DE, PSO, FA:
-    # - Spotřeba: 1 evaluace na jedince za generaci.
-    # - Výpočet: 3000 / 30 = 100 generací.
-
-    # 2. TLBO:
-    # - Spotřeba: 2 evaluace na jedince za generaci (Teacher phase + Learner phase).
-    # - Výpočet: 3000 / (30 * 2) = 50 generací.
-
-    # 3. SOMA (All-to-One):
-    # - Spotřeba: (NP-1) jedinců skáče k lídrovi.
-    # - Kroky: path_length=3.0, step=0.11 => cca 27 kroků na jedince.
-    # - Evaluace na 1 migraci: 29 jedinců * 27 kroků = 783 evaluací.
-    # - Výpočet: 3000 / 783 = 3.83.
-    # - Nastavíme 3 migrace, abychom nepřekročili limit (4 migrace by byly cca 3132 evaluací).
-
+    # --- ROZPOČET Max_OFE ---
+    # Všechny algoritmy běží přes registr (core.registry) s přesným rozpočtem
+    # MAX_OFE evaluací: počet generací/migrací se nastaví jen jako horní mez
+    # a běh se utne přesně po MAX_OFE evaluacích, i uprostřed generace.
+    # Níže jsou tedy jen parametry algoritmů, žádné ručně odhadnuté počty generací.
     algos = {
-        "DE": {"func": differential_evolution, "gens": 100, "args": {"NP": POP_SIZE, "F": 0.5, "CR": 0.9}},
-        "PSO": {"func": particle_swarm_optimization, "gens": 100,
-                "args": {"pop_size": POP_SIZE, "c1": 2.0, "c2": 2.0, "w": 0.7}},
-        "SOMA": {"func": soma_all_to_one, "gens": 3, "args": {"pop_size": POP_SIZE, "path_length": 3.0, "step": 0.11}},
-        "FA": {"func": firefly_algorithm, "gens": 100, "args": {"pop_size": POP_SIZE, "alpha": 0.2, "beta_0": 1.0}},
-        "TLBO": {"func": tlbo, "gens": 50, "args": {"population_size": POP_SIZE}}
+        "DE": {"NP": POP_SIZE, "F": 0.5, "CR": 0.9},
+        "PSO": {"pop_size": POP_SIZE, "c1": 2.0, "c2": 2.0, "w": 0.7},
+        "SOMA": {"pop_size": POP_SIZE, "path_length": 3.0, "step": 0.11},
+        "FA": {"pop_size": POP_SIZE, "alpha": 0.2, "beta_0": 1.0},
+        "TLBO": {"population_size": POP_SIZE},
     }
 
     print(f"=== STARTING BENCHMARK (Exercise 10) ===")
@@ -73,80 +221,69 @@ def run_benchmark():
     print(f"Population: {POP_SIZE}")
     print(f"Max OFE limit: {MAX_OFE}")
     print(f"Experiments per function: {NUM_EXPERIMENTS}")
+    print(f"Workers: {workers or os.cpu_count()}, root seed: {root_seed}")
     print("-" * 60)
 
-    # Použijeme Pandas ExcelWriter pro zápis do více listů (sheetů)
-    try:
-        with pd.ExcelWriter(OUTPUT_FILE, engine='openpyxl') as writer:
-
-            for FuncClass in functions_classes:
-                func_instance = FuncClass(dimension=DIMENSION)
-                print(f"Processing function: {func_instance.name: <15}", end="")
-
-                # Příprava indexů tabulky (Experiment 1..30, Mean, Std)
-                rows = [f"Experiment {i + 1}" for i in range(NUM_EXPERIMENTS)]
-                rows.append("Mean")
-                rows.append("Std. Dev.")
-
-                # Vytvoření prázdného DataFrame pro aktuální funkci
-                results_table = pd.DataFrame(index=rows, columns=algos.keys())
-
-                for algo_name, config in algos.items():
-                    best_values = []
-
-                    # Spuštění 30 experimentů
-                    for i in range(NUM_EXPERIMENTS):
-                        # Vytvoření nové instance funkce (pro čistý start)
-                        f = FuncClass(dimension=DIMENSION)
-
-                        # Příprava argumentů
-                        kwargs = config["args"].copy()
-
-                        # Správné pojmenování parametru pro počet generací/migrací
-                        if algo_name == "SOMA":
-                            kwargs["M_max"] = config["gens"]
-                        elif algo_name == "TLBO":
-                            kwargs["max_generations"] = config["gens"]
-                        elif algo_name == "FA":
-                            kwargs["max_gen"] = config["gens"]
-                        elif algo_name == "DE":
-                            kwargs["G"] = config["gens"]
-                        elif algo_name == "PSO":
-                            kwargs["M_max"] = config["gens"]
-
-                        # Spuštění algoritmu
-                        # Očekává se návratová hodnota: (best_pos, best_val, history)
-                        # history ignorujeme (_) pro úsporu paměti při 30 opakováních
-                        _, best_val, _ = config["func"](f, **kwargs)
-                        best_values.append(best_val)
-
-                    # Zápis výsledků do tabulky
-                    # 1. Hodnoty jednotlivých experimentů
-                    results_table.loc[rows[:NUM_EXPERIMENTS], algo_name] = best_values
+    # --- Mřížka všech běhů (funkce × algoritmus × experiment) ---
+    checkpoints = convergence_checkpoints(MAX_OFE, CHECKPOINTS)
+    dtype = get_default_dtype()
+    tasks = []
+    runs = []
+    function_names = []
+    for FuncClass in functions_classes:
+        function_name = FuncClass(dimension=DIMENSION).name
+        function_names.append(function_name)
+        for algo_name, kwargs in algos.items():
+            spec = get_algorithm(algo_name)
+            params = dict(spec.params(**kwargs), cache_size=EVAL_CACHE_SIZE, count_cache_hits=COUNT_CACHE_HITS,
+                          dtype=dtype.name, checkpoints=CHECKPOINTS)
+            for i in range(NUM_EXPERIMENTS):
+                # Nezávislý, reprodukovatelný seed pro každý experiment
+                seed_seq = experiment_seed(root_seed, function_name, algo_name, i)
+                seed = {"entropy": seed_seq.entropy}
+                tasks.append((FuncClass, DIMENSION, algo_name, kwargs, MAX_OFE,
+                              EVAL_CACHE_SIZE, COUNT_CACHE_HITS, TRACK_MEMORY, checkpoints, dtype, seed_seq))
+                runs.append({"function": function_name, "algorithm": algo_name, "experiment": i,
+                             "dimension": DIMENSION, "max_ofe": MAX_OFE, "params": params, "seed": seed,
+                             "key": run_key(spec.function, params, FuncClass, DIMENSION, MAX_OFE, seed)})
 
-                    # 2. Statistiky (Průměr a Směrodatná odchylka) [cite: 144]
-                    mean_val = np.mean(best_values)
-                    std_val = np.std(best_values)
+    with ResultStore(store_path) as store:
+        # Spočítat jen běhy, které v úložišti ještě nejsou
+        missing = set(store.missing([run["key"] for run in runs], checkpoints))
+        todo = [i for i, run in enumerate(runs) if run["key"] in missing]
+        print(f"Stored runs: {len(runs) - len(todo)}, running {len(todo)} runs...")
 
-                    results_table.loc["Mean", algo_name] = mean_val
-                    results_table.loc["Std. Dev.", algo_name] = std_val
+        # Spuštění běhů s přesným rozpočtem MAX_OFE evaluací, každý výsledek se hned uloží
+        for done, (index, (best_val, telemetry, convergence)) in enumerate(
+                run_experiments([tasks[i] for i in todo], workers), 1):
+            store.put(best_f=best_val, telemetry=telemetry, checkpoints=checkpoints, convergence=convergence,
+                      **runs[todo[index]])
+            if done % 50 == 0 or done == len(todo):
+                print(f"  {done}/{len(todo)}", flush=True)
 
-                    # Malý progress v konzoli (tečka za každý hotový algoritmus)
-                    print(".", end="", flush=True)
+        failed = store.missing([run["key"] for run in runs], checkpoints)
+        if failed:
+            print(f"\n{len(failed)} běhů skončilo chybou (viz výše), export se přeskočí. "
+                  f"Po opravě stačí benchmark spustit znovu, dopočítají se jen chybějící běhy.")
+            return
 
-                # Uložení listu do Excelu (název listu = název funkce)
-                results_table.to_excel(writer, sheet_name=func_instance.name)
-                print(" Done.")
+        # Souhrn telemetrie po algoritmech (přes všechny funkce a experimenty)
+        summary = store.frame([run["key"] for run in runs]).groupby("algorithm", sort=False)[
+            ["wall_time", "evals_per_sec", "objective_fraction", "peak_memory_mb"]].mean()
+        print("-" * 60)
+        print(summary.to_string(float_format=lambda v: f"{v:.3f}"))
 
-        print("=" * 60)
-        print(f"Benchmark finished successfully!")
-        print(f"Results saved to: {os.path.abspath(OUTPUT_FILE)}")
+        try:
+            export_excel(store, runs, OUTPUT_FILE, function_names, list(algos), NUM_EXPERIMENTS)
+        except ImportError:
+            print("\n\nERROR: Chybí knihovna 'openpyxl'. Nainstalujte ji příkazem: pip install openpyxl")
+            return
 
-    except ImportError:
-        print("\n\nERROR: Chybí knihovna 'openpyxl'. Nainstalujte ji příkazem: pip install openpyxl")
-    except Exception as e:
-        print(f"\n\nUNEXPECTED ERROR: {e}")
+    print("=" * 60)
+    print(f"Benchmark finished successfully!")
+    print(f"Results saved to: {os.path.abspath(OUTPUT_FILE)} (store: {os.path.abspath(store_path)})")
 
 
 if __name__ == "__main__":
-    run_benchmark()
\ No newline at end of file
+    # python main.py [workers]
+    run_benchmark(workers=int(sys.argv[1]) if len(sys.argv) > 1 else None)
\ No newline at end of file
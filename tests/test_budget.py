@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from algorithms.differential_evolution import differential_evolution
+from core.base_function import Function
+from core.budget import BudgetExhausted, BudgetedFunction, run_with_budget
+from functions.sphere import Sphere
+
+
+class FirstCoordinate(Function):
+    """f(x) = x[0] – hodnoty evaluací se dají zadat přímo."""
+    def __init__(self):
+        super().__init__("FirstCoordinate", dimension=1)
+
+    def evaluate(self, x):
+        return float(np.asarray(x)[0])
+
+
+def column(values):
+    return np.asarray(values, dtype=float)[:, np.newaxis]
+
+
+def test_batch_is_truncated_to_remaining_budget():
+    budget = BudgetedFunction(FirstCoordinate(), max_evaluations=5)
+    budget.evaluate_batch(column([4.0, 3.0]))
+    with pytest.raises(BudgetExhausted):
+        # zbývají 3 evaluace, hodnota -10 leží až za rozpočtem
+        budget.evaluate_batch(column([2.0, 5.0, 1.0, -10.0]))
+    assert budget.evaluations == 5
+    assert budget.best_f == 1.0
+    assert budget.remaining == 0
+    with pytest.raises(BudgetExhausted):
+        budget.evaluate(np.array([0.0]))
+    assert budget.evaluations == 5
+
+
+def test_empty_batch_does_not_consume_budget():
+    budget = BudgetedFunction(FirstCoordinate(), max_evaluations=1)
+    assert len(budget.evaluate_batch(np.empty((0, 1)))) == 0
+    assert budget.evaluations == 0
+
+
+def test_run_with_budget_stops_exactly():
+    np.random.seed(0)
+    best_x, best_f, history, budget = run_with_budget(
+        differential_evolution, Sphere(dimension=3), 95, NP=10, G=1000, record_history=False)
+    assert history is None   # běh utnul rozpočet
+    assert budget.evaluations == 95
+    assert best_f == budget.best_f == Sphere(3).evaluate(best_x)
+
+
+def test_algorithm_finishing_early_returns_history():
+    np.random.seed(0)
+    _, best_f, history, budget = run_with_budget(
+        differential_evolution, Sphere(dimension=3), 1000, NP=10, G=5, record_history=False)
+    assert history is not None
+    assert budget.evaluations == 50 and budget.remaining == 950
+    assert best_f == budget.best_f
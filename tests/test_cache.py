@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+from core.base_function import Function
+from core.budget import run_with_budget
+from core.cache import CachedFunction
+
+
+class CountingSphere(Function):
+    """Sphere, která si pamatuje, kolik bodů opravdu vyhodnotila."""
+    def __init__(self, dimension=2):
+        super().__init__("CountingSphere", dimension)
+        self.calls = 0
+
+    def evaluate(self, x):
+        self.calls += 1
+        return float(np.sum(np.asarray(x) ** 2))
+
+    def evaluate_batch(self, X):
+        X = np.asarray(X)
+        self.calls += len(X)
+        return np.sum(X ** 2, axis=-1)
+
+
+def point(v):
+    return np.array([v, 0.0])
+
+
+def test_hits_misses_and_values():
+    f = CountingSphere()
+    cache = CachedFunction(f, maxsize=10)
+    assert cache.evaluate(point(2.0)) == 4.0
+    assert cache.evaluate(point(2.0)) == 4.0
+    assert cache.evaluate(point(3.0)) == 9.0
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 2, 0)
+    assert f.calls == 2
+    assert cache.hit_rate == pytest.approx(1 / 3)
+
+
+def test_lru_evicts_least_recently_used():
+    f = CountingSphere()
+    cache = CachedFunction(f, maxsize=2)
+    cache.evaluate(point(1.0))
+    cache.evaluate(point(2.0))
+    cache.evaluate(point(1.0))      # 1 je teď nejnověji použitý
+    cache.evaluate(point(3.0))      # vyhodí 2
+    assert cache.evictions == 1
+
+    calls = f.calls
+    cache.evaluate(point(1.0))
+    assert f.calls == calls         # 1 zůstal v cache
+    cache.evaluate(point(2.0))
+    assert f.calls == calls + 1     # 2 byl vyhozen
+
+
+def test_batch_duplicates_are_evaluated_once():
+    f = CountingSphere()
+    cache = CachedFunction(f, maxsize=10)
+    cache.evaluate(point(5.0))
+    X = np.array([point(1.0), point(2.0), point(1.0), point(5.0), point(2.0)])
+    values = cache.evaluate_batch(X)
+
+    assert list(values) == [1.0, 4.0, 1.0, 25.0, 4.0]
+    assert f.calls == 1 + 2
+    assert (cache.hits, cache.misses) == (3, 3)
+
+
+def test_batch_eviction_counter():
+    cache = CachedFunction(CountingSphere(), maxsize=3)
+    cache.evaluate_batch(np.array([point(float(v)) for v in range(5)]))
+    assert cache.evictions == 2
+    assert len(cache._cache) == 3
+
+
+def test_keys_distinguish_dtype():
+    f = CountingSphere()
+    cache = CachedFunction(f, maxsize=10)
+    cache.evaluate(np.array([0.5, 0.0], dtype=np.float64))
+    cache.evaluate(np.array([0.5, 0.0], dtype=np.float32))
+    assert cache.misses == 2 and cache.hits == 0
+
+    values = cache.evaluate_batch(np.array([[0.5, 0.0]], dtype=np.float32))
+    assert values.dtype == np.float32
+    assert cache.hits == 1
+
+
+def repeat_batch(function, X, repeats):
+    """Algoritmus, který opakovaně vyhodnocuje tutéž dávku (protokol algoritmů: best_x, best_f, history)."""
+    for _ in range(repeats):
+        values = function.evaluate_batch(X)
+    return X[np.argmin(values)], values.min(), []
+
+
+@pytest.mark.parametrize("count_cache_hits, expected_evaluations", [(True, 12), (False, 4)])
+def test_run_with_budget_cache_hits(count_cache_hits, expected_evaluations):
+    f = CountingSphere()
+    X = np.array([point(float(v)) for v in range(4)])
+    _, best_f, history, budget = run_with_budget(repeat_batch, f, 100, cache_size=10,
+                                                 count_cache_hits=count_cache_hits, X=X, repeats=3)
+    assert history == []
+    assert best_f == 0.0
+    assert f.calls == 4                  # skutečně vyhodnocené body
+    assert budget.evaluations == expected_evaluations
+
+
+def test_counted_cache_hits_exhaust_budget():
+    f = CountingSphere()
+    X = np.array([point(float(v)) for v in range(4)])
+    _, _, history, budget = run_with_budget(repeat_batch, f, 6, cache_size=10,
+                                            count_cache_hits=True, X=X, repeats=3)
+    assert history is None
+    assert budget.evaluations == 6
+    assert f.calls == 4
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from core.base_function import Function
+from core.budget import BudgetedFunction, convergence_checkpoints
+from core.registry import run_algorithm
+from core.result_store import ResultStore
+from functions.sphere import Sphere
+
+CHECKPOINTS = np.array([750, 1500, 2250, 3000])
+
+
+class FirstCoordinate(Function):
+    """f(x) = x[0] – hodnoty evaluací se dají zadat přímo."""
+    def __init__(self):
+        super().__init__("FirstCoordinate", dimension=1)
+
+    def evaluate(self, x):
+        return float(np.asarray(x)[0])
+
+
+def column(values):
+    return np.asarray(values, dtype=float)[:, np.newaxis]
+
+
+def test_convergence_checkpoints():
+    assert list(convergence_checkpoints(10, 4)) == [3, 5, 8, 10]
+    # víc checkpointů než evaluací => bez duplicit
+    assert list(convergence_checkpoints(3, 10)) == [1, 2, 3]
+
+
+def test_convergence_records_best_so_far_across_batches():
+    values = [5.0, 7.0, 3.0, 4.0, 6.0, 1.0, 2.0, 8.0]
+    budget = BudgetedFunction(FirstCoordinate(), checkpoints=[1, 2, 4, 6, 8, 12])
+    budget.evaluate_batch(column(values[:3]))
+    budget.evaluate(np.array([values[3]]))
+    budget.evaluate_batch(column(values[4:]))
+    # checkpoint 12 běh nedosáhl => konečná nejlepší hodnota
+    assert list(budget.convergence()) == [5.0, 5.0, 3.0, 1.0, 1.0, 1.0]
+
+
+def test_nan_is_ignored_by_best_and_curve():
+    budget = BudgetedFunction(FirstCoordinate(), checkpoints=[1, 2, 3])
+    budget.evaluate_batch(column([np.nan, 2.0, np.nan]))
+    assert budget.best_f == 2.0
+    assert budget.best_x[0] == 2.0
+    assert list(budget.convergence()) == [np.inf, 2.0, 2.0]
+
+
+
+
+def test_convergence_without_checkpoints():
+    budget = BudgetedFunction(FirstCoordinate(), max_evaluations=10)
+    budget.evaluate(np.array([1.0]))
+    with pytest.raises(ValueError, match="checkpoints"):
+        budget.convergence()
+
+
+def test_registry_run_curve_ends_at_best():
+    np.random.seed(3)
+    checkpoints = convergence_checkpoints(600, 6)
+    _, best_f, _, budget = run_algorithm("DE", Sphere(dimension=4), 600, checkpoints=checkpoints)
+    curve = budget.convergence()
+    assert len(curve) == 6
+    assert np.all(np.diff(curve) <= 0)
+    assert curve[-1] == best_f
+
+
+def put(store, key, checkpoints):
+    store.put(key, "Sphere", "DE", 0, 30, 3000, {"checkpoints": len(checkpoints)}, {"entropy": 1}, 1.0,
+              telemetry={"wall_time": 0.5}, checkpoints=checkpoints,
+              convergence=np.linspace(10.0, 1.0, len(checkpoints)))
+
+
+def test_missing_recomputes_runs_with_other_checkpoints(tmp_path):
+    with ResultStore(str(tmp_path / "runs.sqlite")) as store:
+        put(store, "a", CHECKPOINTS)
+        put(store, "b", checkpoints=np.array([1500, 3000]))
+        assert store.missing(["a", "b"]) == []
+        assert store.missing(["a", "b"], CHECKPOINTS) == ["b"]
+        with pytest.raises(ValueError):
+            store.convergence(["a", "b"])
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from core.distance_matrix import DistanceMatrix, metric_distances
+from core.tsplib import TSPInstance
+
+# Prvních 5 měst burma14 (TSPLIB, GEO)
+BURMA = np.array([
+    [16.47, 96.10],
+    [16.47, 94.44],
+    [20.09, 92.54],
+    [22.39, 93.37],
+    [25.23, 97.24],
+])
+
+
+@pytest.mark.parametrize("metric", ["EUCLIDEAN", "EUC_2D", "CEIL_2D", "ATT", "GEO"])
+def test_lazy_matches_dense(metric):
+    dense = DistanceMatrix(BURMA, metric=metric)
+    lazy = DistanceMatrix(BURMA, lazy=True, metric=metric)
+    a, b = np.meshgrid(np.arange(5), np.arange(5), indexing="ij")
+    assert np.array_equal(lazy.pair(a, b), dense.matrix)
+    assert lazy.pair(0, 1) == dense.matrix[0, 1]
+    d = lazy.scalar_distance()
+    assert d(0, 1) == dense.matrix[0, 1]
+    assert d(2, 2) == 0.0
+
+
+def test_geo_burma14_distances():
+    # hodnoty z matice burma14 (vzdálenosti 1-2, 1-3 a 1-5)
+    d = DistanceMatrix(BURMA, lazy=True, metric="GEO")
+    assert [d.pair(0, 1), d.pair(0, 2), d.pair(0, 4)] == [153, 510, 966]
+
+
+def test_metric_rounding():
+    a, b = np.array([0.0, 0.0]), np.array([3.0, 4.4])  # eukleidovsky 5.35...
+    assert metric_distances(a, b, "EUC_2D") == 5
+    assert metric_distances(a, b, "CEIL_2D") == 6
+    # ATT: pseudo-eukleidovská vzdálenost sqrt(d²/10) zaokrouhlená nahoru
+    assert metric_distances(a, b, "ATT") == 2
+    with pytest.raises(ValueError):
+        metric_distances(a, b, "MANHATTAN")
+
+
+def test_for_cities_applies_dtype_and_lazy_to_instances():
+    instance = TSPInstance("burma5", "GEO", coords=BURMA)
+    dist = DistanceMatrix.for_cities(instance, dtype=np.float32, lazy=True)
+    assert dist.dtype == np.float32 and dist.lazy and dist.metric == "GEO"
+    assert DistanceMatrix.for_cities(instance, dtype=np.float32, lazy=True) is dist
+    with pytest.raises(ValueError):
+        DistanceMatrix.for_cities(instance, metric="EUC_2D")
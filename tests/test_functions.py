@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from functions.ackley import Ackley
+from functions.griewank import Griewank
+from functions.levy import Levy
+from functions.michalewicz import Michalewicz
+from functions.rastrigin import Rastrigin
+from functions.rosenbrock import Rosenbrock
+from functions.schwefel import Schwefel
+from functions.sphere import Sphere
+from functions.zakharov import Zakharov
+
+
+# Původní skalární vzorce (po složkách), proti kterým se kontrolují dávkové kernely
+def ackley(x, a=20, b=0.2, c=2 * np.pi):
+    d = len(x)
+    term1 = -a * np.exp(-b * np.sqrt(sum(xi ** 2 for xi in x) / d))
+    term2 = -np.exp(sum(np.cos(c * xi) for xi in x) / d)
+    return term1 + term2 + a + np.exp(1)
+
+
+def griewank(x):
+    prod_val = 1.0
+    for i, xi in enumerate(x):
+        prod_val *= np.cos(xi / np.sqrt(i + 1))
+    return sum(xi ** 2 for xi in x) / 4000 - prod_val + 1
+
+
+def levy(x):
+    w = [1 + (xi - 1) / 4 for xi in x]
+    sum_val = sum((wi - 1) ** 2 * (1 + 10 * np.sin(np.pi * wi + 1) ** 2) for wi in w[:-1])
+    return np.sin(np.pi * w[0]) ** 2 + sum_val + (w[-1] - 1) ** 2 * (1 + np.sin(2 * np.pi * w[-1]) ** 2)
+
+
+def michalewicz(x, m=10):
+    return -sum(np.sin(xi) * np.sin((i + 1) * xi ** 2 / np.pi) ** (2 * m) for i, xi in enumerate(x))
+
+
+def rastrigin(x):
+    return 10 * len(x) + sum(xi ** 2 - 10 * np.cos(2 * np.pi * xi) for xi in x)
+
+
+def rosenbrock(x):
+    return sum(100 * (x[i + 1] - x[i] ** 2) ** 2 + (x[i] - 1) ** 2 for i in range(len(x) - 1))
+
+
+def schwefel(x):
+    return 418.9829 * len(x) - sum(xi * np.sin(np.sqrt(abs(xi))) for xi in x)
+
+
+def sphere(x):
+    return sum(xi ** 2 for xi in x)
+
+
+def zakharov(x):
+    sum2 = sum(0.5 * (i + 1) * xi for i, xi in enumerate(x))
+    return sum(xi ** 2 for xi in x) + sum2 ** 2 + sum2 ** 4
+
+
+FUNCTIONS = [
+    (Ackley, ackley), (Griewank, griewank), (Levy, levy), (Michalewicz, michalewicz),
+    (Rastrigin, rastrigin), (Rosenbrock, rosenbrock), (Schwefel, schwefel),
+    (Sphere, sphere), (Zakharov, zakharov),
+]
+
+
+@pytest.mark.parametrize("FuncClass, formula", FUNCTIONS, ids=lambda v: getattr(v, "__name__", ""))
+@pytest.mark.parametrize("dimension", [2, 7])
+def test_batch_matches_scalar_formula(FuncClass, formula, dimension):
+    f = FuncClass(dimension=dimension)
+    rng = np.random.default_rng(dimension)
+    X = rng.uniform(f.lower_bound, f.upper_bound, size=(20, dimension))
+    expected = np.array([formula(list(x)) for x in X])
+
+    assert np.allclose(f.evaluate_batch(X), expected, rtol=1e-12, atol=1e-12)
+    assert np.allclose([f.evaluate(x) for x in X], expected, rtol=1e-12, atol=1e-12)
+    # mřížka (..., D) pro vizualizaci
+    assert np.allclose(f.evaluate_batch(X.reshape(4, 5, dimension)), expected.reshape(4, 5),
+                       rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("FuncClass, formula", FUNCTIONS, ids=lambda v: getattr(v, "__name__", ""))
+def test_array_like_input(FuncClass, formula):
+    f = FuncClass(dimension=2)
+    points = [[0.5, 1.0], [1, 2]]
+    expected = [formula([float(v) for v in x]) for x in points]
+    assert np.allclose(f.evaluate_batch(points), expected)
+    assert np.isclose(f.evaluate([0.5, 1.0]), expected[0])
@@ -0,0 +1,63 @@
+import gc
+import os
+import numpy as np
+
+import core.history
+from core.history import HistoryRecorder, history_arrays
+
+
+def test_capacity_is_only_a_hint():
+    history = HistoryRecorder(10**9, None, 30)
+    assert history.capacity < 10**6
+    history.record_many(np.ones((10**6, 30)), np.arange(10**6, dtype=float))
+    assert len(history) == 10**6
+    assert history.fitness[-1] == 10**6 - 1
+
+
+def test_grows_past_capacity_and_keeps_rows():
+    history = HistoryRecorder(2, 3, 2)
+    for g in range(5):
+        history.record(np.full((3, 2), g), np.full(3, g))
+    assert history.positions.shape == (5, 3, 2)
+    assert list(history.fitness[:, 0]) == [0, 1, 2, 3, 4]
+
+
+def test_every_and_list_interface():
+    history = HistoryRecorder(10, None, 1, every=3)
+    history.record_many(np.arange(5.0)[:, None], np.arange(5.0))
+    for step in range(5, 10):
+        history.record(np.array([step]), float(step))
+    assert list(history.generations) == [0, 3, 6, 9]
+    assert [f for _, f in history] == [0.0, 3.0, 6.0, 9.0]
+    x, f = history[-1]
+    assert x[0] == 9.0 and f == 9.0
+
+    positions, fitness = history_arrays([(np.array([1.0]), 1.0), (np.array([2.0]), 2.0)])
+    assert positions.shape == (2, 1) and list(fitness) == [1.0, 2.0]
+
+
+def test_disabled_recorder_stores_nothing():
+    history = HistoryRecorder(100, 10, 5, enabled=False)
+    history.record(np.zeros((10, 5)), np.zeros(10))
+    assert len(history) == 0 and history.steps == 1
+
+
+def test_empty_list_history():
+    positions, fitness = history_arrays([])
+    assert len(positions) == 0 and len(fitness) == 0
+
+
+def test_spilled_growth_keeps_one_file_per_part(tmp_path, monkeypatch):
+    monkeypatch.setattr(core.history, "SPILL_THRESHOLD_MB", 0)
+    history = HistoryRecorder(1, 4, 3, spill_dir=str(tmp_path))
+    assert isinstance(history._positions, np.memmap)
+    for g in range(20):
+        history.record(np.full((4, 3), g), np.full(4, g))
+
+    assert len(os.listdir(tmp_path)) == 2   # positions + fitness, staré soubory jsou smazané
+    assert os.path.exists(history.spill_path)
+    assert list(history.fitness[:, 0]) == list(range(20))
+
+    del history
+    gc.collect()
+    assert os.listdir(tmp_path) == []
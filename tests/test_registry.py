@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from core import registry
+from core.registry import available_algorithms, get_algorithm, run_algorithm
+from functions.sphere import Sphere
+
+
+def test_all_algorithms_are_registered():
+    assert set(available_algorithms()) >= {"Blind", "DE", "FA", "HC", "PSO", "SA", "SOMA", "TLBO"}
+    with pytest.raises(ValueError, match="NoSuchAlgorithm"):
+        get_algorithm("NoSuchAlgorithm")
+
+
+def test_algorithms_are_loaded_once(monkeypatch):
+    get_algorithm("DE")
+    monkeypatch.setattr(registry.importlib, "import_module",
+                        lambda name: pytest.fail(f"opakovaný import {name}"))
+    get_algorithm("PSO")
+
+
+def test_params_drop_iteration_count():
+    spec = get_algorithm("DE")
+    params = spec.params(NP=10, G=999)
+    assert params["NP"] == 10 and "G" not in params
+
+
+@pytest.mark.parametrize("algorithm, params, expected", [
+    ("DE", {"NP": 30}, 101),                      # ceil(3000 / 30) + 1
+    ("DE", {}, 101),                              # výchozí NP=30 ze signatury
+    ("TLBO", {"population_size": 30}, 51),        # 2 × 30 evaluací na generaci
+    ("HC", {"climbers": 4, "neighbors": 8}, 95),  # ceil(3000 / 32) + 1
+    ("SOMA", {"pop_size": 31}, 101),              # lídr se nehýbe
+    ("Blind", {}, 3001),
+])
+def test_iterations_for_budget(algorithm, params, expected):
+    assert get_algorithm(algorithm).iterations_for_budget(3000, **params) == expected
+
+
+@pytest.mark.parametrize("algorithm", ["Blind", "DE", "FA", "HC", "PSO", "SOMA", "TLBO"])
+def test_registry_runs_use_the_whole_budget(algorithm):
+    np.random.seed(1)
+    _, _, _, budget = run_algorithm(algorithm, Sphere(dimension=5), 500)
+    assert budget.evaluations == 500
+
+
+def test_simulated_annealing_may_stop_early():
+    # SA končí při Tmin, rozpočet je jen horní mez
+    np.random.seed(1)
+    _, _, _, budget = run_algorithm("SA", Sphere(dimension=5), 100_000)
+    assert 0 < budget.evaluations < 100_000
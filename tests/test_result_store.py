@@ -0,0 +1,76 @@
+import numpy as np
+
+from algorithms.differential_evolution import differential_evolution
+from core.result_store import ResultStore, run_key
+from functions.rastrigin import Rastrigin
+from functions.sphere import Sphere
+
+PARAMS = {"NP": 30, "F": 0.5, "dtype": "float64", "checkpoints": 4}
+SEED = {"entropy": 12345}
+CHECKPOINTS = np.array([750, 1500, 2250, 3000])
+
+
+def key(**changes):
+    args = dict(algorithm=differential_evolution, params=PARAMS, function=Sphere, dimension=30,
+                max_ofe=3000, seed=SEED)
+    args.update(changes)
+    return run_key(**args)
+
+
+def put(store, run_key_, experiment=0, best_f=1.0, checkpoints=CHECKPOINTS, convergence=None):
+    if convergence is None:
+        convergence = np.linspace(10.0, best_f, len(checkpoints))
+    store.put(run_key_, "Sphere", "DE", experiment, 30, 3000, PARAMS, SEED, best_f,
+              telemetry={"wall_time": 0.5, "evaluations": 3000}, checkpoints=checkpoints,
+              convergence=convergence)
+
+
+def test_run_key_is_stable_and_covers_every_input():
+    assert key() == key(params=dict(reversed(list(PARAMS.items()))))
+    changed = [key(params=dict(PARAMS, F=0.6)), key(params=dict(PARAMS, checkpoints=100)),
+               key(function=Rastrigin), key(dimension=10), key(max_ofe=6000), key(seed={"entropy": 1})]
+    assert len({key(), *changed}) == len(changed) + 1
+
+
+def test_missing_and_resume(tmp_path):
+    path = str(tmp_path / "runs.sqlite")
+    keys = [key(seed={"entropy": i}) for i in range(3)]
+    with ResultStore(path) as store:
+        assert store.missing(keys) == keys
+        put(store, keys[1])
+
+    # nové otevření úložiště = restart přerušeného benchmarku
+    with ResultStore(path) as store:
+        assert len(store) == 1 and keys[1] in store
+        assert store.missing(keys) == [keys[0], keys[2]]
+
+
+def test_runs_without_telemetry_count_as_missing(tmp_path):
+    with ResultStore(str(tmp_path / "runs.sqlite")) as store:
+        store.put("old", "Sphere", "DE", 0, 30, 3000, PARAMS, SEED, 1.0)
+        assert "old" in store
+        assert store.missing(["old"]) == ["old"]
+
+
+def test_frame_and_convergence_round_trip(tmp_path):
+    with ResultStore(str(tmp_path / "runs.sqlite")) as store:
+        put(store, "b", experiment=1, best_f=2.0)
+        put(store, "a", experiment=0, best_f=1.0)
+
+        df = store.frame(["a", "b"])
+        assert list(df["key"]) == ["a", "b"]
+        assert list(df["best_f"]) == [1.0, 2.0]
+        assert list(df["wall_time"]) == [0.5, 0.5]
+        assert df["peak_memory_mb"].isna().all()
+
+        checkpoints, curves = store.convergence(["a", "b"])
+        assert np.array_equal(checkpoints, CHECKPOINTS)
+        assert np.array_equal(curves, [np.linspace(10.0, 1.0, 4), np.linspace(10.0, 2.0, 4)])
+
+
+def test_nan_is_stored_as_inf(tmp_path):
+    with ResultStore(str(tmp_path / "runs.sqlite")) as store:
+        put(store, "nan", best_f=np.nan, convergence=np.array([np.nan, np.nan, 3.0, 2.0]))
+        assert store.frame(["nan"])["best_f"][0] == np.inf
+        _, curves = store.convergence(["nan"])
+        assert list(curves[0]) == [np.inf, np.inf, 3.0, 2.0]
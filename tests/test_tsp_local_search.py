@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+
+from algorithms.tsp_local_search import (LocalSearch, _Tour, _improve_city_2opt, _improve_city_or_opt,
+                                         improve_tour, nearest_neighbor_lists)
+from core.distance_matrix import DistanceMatrix
+
+METHODS = ["2opt", "oropt", "2opt+oropt"]
+
+
+def instance(n, seed):
+    rng = np.random.default_rng(seed)
+    cities = rng.uniform(0, 100, size=(n, 2))
+    dist = DistanceMatrix(cities)
+    neighbors, _ = nearest_neighbor_lists(dist, 8)
+    return dist, neighbors, rng
+
+
+def edges(route):
+    return {frozenset(e) for e in zip(route, np.roll(route, -1))}
+
+
+def assert_permutation(route, n):
+    assert sorted(np.asarray(route).tolist()) == list(range(n))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_move_segment_keeps_permutation_and_order(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(6, 30))
+    tour = _Tour(rng.permutation(n), None)
+    length = int(rng.integers(1, 4))
+    first = int(rng.integers(n))
+    segment = [tour.route[(tour.pos[first] + t) % n] for t in range(length)]
+    outside = [c for c in tour.route if c not in segment]
+    u = outside[int(rng.integers(len(outside)))]
+    reverse = bool(rng.integers(2))
+
+    tour.move_segment(list(segment), u, reverse)
+
+    assert_permutation(tour.route, n)
+    assert all(tour.route[tour.pos[c]] == c for c in range(n))
+    inserted = segment[::-1] if reverse else segment
+    after_u = [tour.route[(tour.pos[u] + 1 + t) % n] for t in range(length)]
+    assert after_u == inserted
+    # zbytek cesty si zachová cyklické pořadí
+    rest = [tour.route[(tour.pos[u] + 1 + length + t) % n] for t in range(n - length - 1)]
+    start = outside.index(u)
+    assert [u] + rest == outside[start:] + outside[:start]
+
+
+@pytest.mark.parametrize("improve_city", ["2opt", "oropt"])
+@pytest.mark.parametrize("seed", range(10))
+def test_single_move_gain_matches_tour_length(improve_city, seed):
+    dist, neighbors, rng = instance(40, seed)
+    neighbor_lists = neighbors.tolist()
+    tour = _Tour(rng.permutation(40), dist.scalar_distance())
+    moves = 0
+    for a in rng.permutation(40).tolist():
+        before = dist.tour_length(tour.route)
+        if improve_city == "2opt":
+            gain, touched = _improve_city_2opt(tour, a, neighbor_lists, 1e-10)
+        else:
+            gain, touched = _improve_city_or_opt(tour, a, neighbor_lists, 3, 1e-10)
+        assert_permutation(tour.route, 40)
+        assert gain == pytest.approx(before - dist.tour_length(tour.route), abs=1e-9)
+        if gain > 0:
+            moves += 1
+            assert a in touched
+        else:
+            assert touched == ()
+    assert moves > 0
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("seed", range(5))
+def test_improve_reports_exact_gain(method, seed):
+    dist, neighbors, rng = instance(60, seed)
+    route = rng.permutation(60)
+    improved, gain = LocalSearch(dist, neighbors, method).improve(route)
+
+    assert_permutation(improved, 60)
+    assert gain > 0
+    assert gain == pytest.approx(dist.tour_length(route) - dist.tour_length(improved), abs=1e-9)
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_result_is_local_optimum(method):
+    # don't-look bity nesmí přeskočit město, u kterého ještě existuje zlepšující tah
+    dist, neighbors, rng = instance(80, 1)
+    improved, _ = LocalSearch(dist, neighbors, method).improve(rng.permutation(80))
+
+    for a in range(80):
+        tour = _Tour(improved, dist.scalar_distance())
+        if "2opt" in method:
+            assert _improve_city_2opt(tour, a, neighbors.tolist(), 1e-10)[0] == 0.0
+        if "oropt" in method:
+            assert _improve_city_or_opt(tour, a, neighbors.tolist(), 3, 1e-10)[0] == 0.0
+
+    again, gain = LocalSearch(dist, neighbors, method).improve(improved)
+    assert gain == 0.0 and np.array_equal(again, improved)
+
+
+def test_move_limit():
+    dist, neighbors, rng = instance(60, 2)
+    route = rng.permutation(60)
+    unchanged, gain = LocalSearch(dist, neighbors, max_moves=0).improve(route)
+    assert gain == 0.0 and np.array_equal(unchanged, route)
+
+    _, full_gain = LocalSearch(dist, neighbors).improve(route)
+    one, one_gain = LocalSearch(dist, neighbors, max_moves=1).improve(route)
+    assert 0 < one_gain < full_gain
+    assert one_gain == pytest.approx(dist.tour_length(route) - dist.tour_length(one), abs=1e-9)
+    # jeden tah (2-opt nebo Or-opt) odebere nejvýš 3 hrany
+    assert len(edges(route) - edges(one)) <= 3
+
+
+def test_time_limit():
+    dist, neighbors, rng = instance(60, 3)
+    route = rng.permutation(60)
+    unchanged, gain = LocalSearch(dist, neighbors, time_limit=0.0).improve(route)
+    assert gain == 0.0 and np.array_equal(unchanged, route)
+
+
+def test_improve_tour_and_lazy_matrix_agree():
+    dist, neighbors, rng = instance(50, 4)
+    route = rng.permutation(50)
+    lazy = DistanceMatrix(dist.cities, lazy=True)
+    assert np.array_equal(improve_tour(route, dist.cities, neighbors)[0],
+                          LocalSearch(lazy, neighbors).improve(route)[0])
+
+
+def test_unknown_method():
+    dist, neighbors, _ = instance(10, 0)
+    with pytest.raises(ValueError):
+        LocalSearch(dist, neighbors, "3opt")
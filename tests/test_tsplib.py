@@ -0,0 +1,129 @@
+import os
+import numpy as np
+import pytest
+
+from core.tsplib import load_tour, load_tsplib, parse_tsp
+
+SQUARE = """NAME : square5
+COMMENT : 4 rohy čtverce a střed
+TYPE : TSP
+DIMENSION : 5
+EDGE_WEIGHT_TYPE : EUC_2D
+NODE_COORD_SECTION
+1 0 0
+3 10 10
+2 10 0
+4 0 10
+5 5 5
+EOF
+"""
+
+SQUARE_TOUR = """NAME : square5.opt.tour
+TYPE : TOUR
+DIMENSION : 5
+TOUR_SECTION
+1
+2
+5
+3
+4
+-1
+EOF
+"""
+
+# 4 města, horní trojúhelník bez diagonály po řádcích: d12 d13 d14 / d23 d24 / d34
+EXPLICIT = """NAME : explicit4
+TYPE : TSP
+DIMENSION : 4
+EDGE_WEIGHT_TYPE : EXPLICIT
+EDGE_WEIGHT_FORMAT : UPPER_ROW
+EDGE_WEIGHT_SECTION
+ 1 2 3
+ 4 5
+ 6
+EOF
+"""
+
+
+def write(directory, name, text):
+    path = os.path.join(directory, name)
+    with open(path, "w") as fh:
+        fh.write(text)
+    return path
+
+
+def test_parse_node_coords_in_index_order(tmp_path):
+    meta, coords, display = parse_tsp(write(tmp_path, "square5.tsp", SQUARE))
+    assert meta == {"name": "square5", "comment": "4 rohy čtverce a střed", "edge_weight_type": "EUC_2D"}
+    assert np.array_equal(coords, [[0, 0], [10, 0], [10, 10], [0, 10], [5, 5]])
+    assert display is None
+
+
+def test_explicit_triangular_matrix(tmp_path):
+    instance = load_tsplib(write(tmp_path, "explicit4.tsp", EXPLICIT), cache_dir=None)
+    expected = [[0, 1, 2, 3], [1, 0, 4, 5], [2, 4, 0, 6], [3, 5, 6, 0]]
+    assert np.array_equal(instance.matrix, expected)
+    assert instance.coords is None and instance.dimension == 4
+    assert instance.tour_length([0, 1, 2, 3]) == 1 + 4 + 6 + 3
+
+
+def test_unsupported_edge_weight_type(tmp_path):
+    path = write(tmp_path, "bad.tsp", SQUARE.replace("EUC_2D", "MAN_2D"))
+    with pytest.raises(ValueError, match="MAN_2D"):
+        parse_tsp(path)
+
+
+def test_optimal_tour_and_gap(tmp_path):
+    path = write(tmp_path, "square5.tsp", SQUARE)
+    write(tmp_path, "square5.opt.tour", SQUARE_TOUR)
+    instance = load_tsplib(path, cache_dir=None)
+
+    assert list(instance.optimal_tour) == [0, 1, 4, 2, 3]
+    # 10 + round(sqrt(50)) + round(sqrt(50)) + 10 + 10
+    assert instance.optimal_length == 44
+    assert instance.gap(44 * 1.5) == pytest.approx(50.0)
+    assert load_tsplib(path, optimum=40, cache_dir=None).gap(44) == pytest.approx(10.0)
+    assert list(load_tour(os.path.join(tmp_path, "square5.opt.tour"))) == [0, 1, 4, 2, 3]
+
+
+def test_gap_without_optimum(tmp_path):
+    instance = load_tsplib(write(tmp_path, "explicit4.tsp", EXPLICIT), cache_dir=None)
+    assert instance.gap(10) is None
+
+
+@pytest.mark.parametrize("name, text", [("square5.tsp", SQUARE), ("explicit4.tsp", EXPLICIT)])
+def test_binary_cache_round_trip(tmp_path, name, text):
+    path = write(tmp_path, name, text)
+    cache_dir = str(tmp_path / "cache")
+    parsed = load_tsplib(path, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 2   # .npy + .json
+
+    cached = load_tsplib(path, cache_dir=cache_dir)
+    data = cached.matrix if cached.matrix is not None else cached.coords
+    assert isinstance(data, np.memmap)
+    assert cached.name == parsed.name and cached.edge_weight_type == parsed.edge_weight_type
+    assert np.array_equal(cached.distance_matrix().matrix, parsed.distance_matrix().matrix)
+
+    # změna souboru => nový klíč cache, data se rozparsují znovu
+    os.utime(path, ns=(0, 0))
+    load_tsplib(path, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 4
+
+
+def test_full_matrix_weight_count(tmp_path):
+    full = EXPLICIT.replace("UPPER_ROW", "FULL_MATRIX")
+    with pytest.raises(ValueError, match="očekáváno 16"):
+        parse_tsp(write(tmp_path, "short.tsp", full))
+    values = " ".join(str(v) for v in range(16))
+    _, matrix, _ = parse_tsp(write(tmp_path, "full.tsp", full.replace(" 1 2 3\n 4 5\n 6", values)))
+    assert np.array_equal(matrix, np.arange(16).reshape(4, 4))
+    with pytest.raises(ValueError, match="očekáváno 16"):
+        parse_tsp(write(tmp_path, "long.tsp", full.replace(" 1 2 3\n 4 5\n 6", values + " 16")))
+
+
+def test_visualize_explicit_instance_without_coords(tmp_path):
+    from core.visualization_tsp import visualize_tsp
+
+    instance = load_tsplib(write(tmp_path, "explicit4.tsp", EXPLICIT), cache_dir=None)
+    with pytest.raises(ValueError, match="souřadnice"):
+        visualize_tsp([([0, 1, 2, 3], 14.0)], instance, str(tmp_path / "tsp.gif"))